@@ -0,0 +1,258 @@
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Dict, Tuple
+
+import pygame
+
+from atlas import ATLAS_INDEX, Atlas
+
+logger = logging.getLogger(__name__)
+
+# os caminhos são relativos à raiz do projeto, não ao diretório de trabalho
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+IMAGES = {
+    "player/center": "assets/Player/Player_Center.png",
+    "player/left": "assets/Player/Player_Turned_to_Left.png",
+    "player/right": "assets/Player/Player_Turned_to_Right.png",
+    "ghost/normal/red": "assets/Ghost_Normal/Normal_Red.png",
+    "ghost/normal/green": "assets/Ghost_Normal/Normal_Green.png",
+    "ghost/normal/blue": "assets/Ghost_Normal/Normal_Blue.png",
+    "ghost/goat/red": "assets/Ghost_Goat/Goat_Red.png",
+    "ghost/goat/green": "assets/Ghost_Goat/Goat_Green.png",
+    "ghost/goat/blue": "assets/Ghost_Goat/Goat_Blue.png",
+    "ghost/eye/red": "assets/Ghost_Eye/Eye_Red.png",
+    "ghost/eye/green": "assets/Ghost_Eye/Eye_Green.png",
+    "ghost/eye/blue": "assets/Ghost_Eye/Eye_Blue.png",
+    "menu/fundo": "menuzinho/imagens/fundomenu.png",
+    "menu/cantos": "menuzinho/imagens/detalhecantos.png",
+    "menu/titulo": "menuzinho/imagens/título provisório.png",
+    "menu/jogar": "menuzinho/imagens/jogarbotao.png",
+    "menu/sair": "menuzinho/imagens/sairbotao.png",
+    "menu/botao_menu": "menuzinho/imagens/botãomenu.png",
+    "menu/gameover": "menuzinho/imagens/gameover.png",
+}
+
+FONTS = {
+    "alagard": "menuzinho/fonts/alagard.ttf",
+}
+
+SOUNDS = {
+    "flash": "sons/flash.wav",
+    "estatua_morre": "sons/morteestatua.wav",
+}
+
+# músicas longas não viram Sound: tocam em streaming (ver audio.py)
+MUSIC = {
+    "menu": "sons/menu.mp3",
+    "bgm": "sons/bgm.wav",
+    "gameover": "sons/OMORI OST - 001 Title.wav",
+}
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound: pygame.mixer.Sound) -> int:
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+    frequency, size, channels = init
+    return int(sound.get_length() * frequency * channels * (abs(size) // 8))
+
+
+class SilentSound:
+    # substituto de pygame.mixer.Sound para quando o jogo roda sem áudio
+    def play(self, *args, **kwargs) -> None:
+        return None
+
+    def stop(self) -> None:
+        pass
+
+    def set_volume(self, value: float) -> None:
+        pass
+
+    def get_length(self) -> float:
+        return 0.0
+
+
+class AssetRegistry:
+    # cada imagem, fonte e som é decodificado uma única vez e compartilhado
+    # por chave; nada aqui deve ser chamado pela primeira vez dentro do loop
+    images: Dict[str, str]
+    fonts: Dict[str, str]
+    sounds: Dict[str, str]
+    music: Dict[str, str]
+    load_counts: Counter
+
+    def __init__(
+        self,
+        root: str = ROOT,
+        images: Dict[str, str] = IMAGES,
+        fonts: Dict[str, str] = FONTS,
+        sounds: Dict[str, str] = SOUNDS,
+        music: Dict[str, str] = MUSIC,
+        atlas: str | None = ATLAS_INDEX,
+    ):
+        self.root = root
+        self.images = dict(images)
+        self.fonts = dict(fonts)
+        self.sounds = dict(sounds)
+        self.music = dict(music)
+        self.load_counts = Counter()
+        # índice gerado por "python atlas.py"; sem ele as imagens vêm dos
+        # arquivos soltos
+        self.atlas_index = atlas
+        self._atlas: Atlas | None = None
+        self._atlas_checked = atlas is None
+
+        self._images: Dict[str, pygame.Surface] = {}
+        self._converted: set = set()
+        self._scaled: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        self._fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        # o carregamento em segundo plano (loader.py) decodifica numa thread
+        # enquanto o menu já usa o registro
+        self._lock = threading.RLock()
+
+    def path(self, relative: str) -> str:
+        return os.path.join(self.root, relative)
+
+    @property
+    def atlas(self) -> Atlas | None:
+        # aberto no primeiro uso, para que importar o registro não leia nada
+        if not self._atlas_checked:
+            with self._lock:
+                if not self._atlas_checked:
+                    self._atlas = Atlas.load(self.path(self.atlas_index), self.root)
+                    self._atlas_checked = True
+        return self._atlas
+
+    def decode(self, key: str) -> pygame.Surface:
+        # só lê o arquivo, sem convert_alpha: pode rodar fora da thread
+        # principal, a conversão fica para o primeiro image()
+        with self._lock:
+            surface = self._images.get(key)
+            if surface is None:
+                atlas = self.atlas
+                if atlas is not None and key in atlas:
+                    loaded = len(atlas.sheets)
+                    surface = atlas.sprite(key)
+                    self.load_counts["atlas"] += len(atlas.sheets) - loaded
+                else:
+                    surface = pygame.image.load(self.path(self.images[key]))
+                    self.load_counts["image"] += 1
+                self._images[key] = surface
+            return surface
+
+    def image(self, key: str) -> pygame.Surface:
+        surface = self._images.get(key)
+        if surface is None:
+            surface = self.decode(key)
+
+        # convert_alpha só funciona depois do set_mode, então a conversão
+        # acontece no primeiro acesso com a janela já aberta
+        if key not in self._converted and pygame.display.get_surface() is not None:
+            atlas = self.atlas
+            if atlas is not None and key in atlas:
+                # converte a folha inteira uma vez e pega de novo a subsurface
+                with self._lock:
+                    atlas.convert(key)
+                    surface = atlas.sprite(key)
+            else:
+                surface = surface.convert_alpha()
+            self._images[key] = surface
+            self._converted.add(key)
+
+        return surface
+
+    def scaled(self, key: str, size: Tuple[int, int]) -> pygame.Surface:
+        size = (int(size[0]), int(size[1]))
+        surface = self._scaled.get((key, size))
+        if surface is None or key not in self._converted:
+            surface = pygame.transform.scale(self.image(key), size)
+            self._scaled[(key, size)] = surface
+        return surface
+
+    def font(self, key: str, size: int) -> pygame.font.Font:
+        font = self._fonts.get((key, size))
+        if font is None:
+            font = pygame.font.Font(self.path(self.fonts[key]), size)
+            self.load_counts["font"] += 1
+            self._fonts[(key, size)] = font
+        return font
+
+    def sound(self, key: str) -> pygame.mixer.Sound:
+        sound = self._sounds.get(key)
+        if sound is None:
+            with self._lock:
+                sound = self._sounds.get(key)
+                if sound is None:
+                    sound = pygame.mixer.Sound(self.path(self.sounds[key]))
+                    self.load_counts["sound"] += 1
+                    self._sounds[key] = sound
+        return sound
+
+    def preload(self, sounds: bool = True) -> None:
+        for key in self.images:
+            self.image(key)
+        if sounds and pygame.mixer.get_init() is not None:
+            for key in self.sounds:
+                self.sound(key)
+
+    def bytes_resident(self) -> Dict[str, int]:
+        atlas = self._atlas
+        return {
+            # as subsurfaces do atlas não têm pixels próprios
+            "image": sum(
+                surface_bytes(s)
+                for s in self._images.values()
+                if s.get_parent() is None
+            ),
+            "atlas": atlas.bytes_resident() if atlas is not None else 0,
+            "scaled": sum(surface_bytes(s) for s in self._scaled.values()),
+            "font": sum(
+                os.path.getsize(self.path(self.fonts[key])) for key, _ in self._fonts
+            ),
+            "sound": sum(sound_bytes(s) for s in self._sounds.values()),
+        }
+
+    def stats(self) -> dict:
+        resident = self.bytes_resident()
+        return {
+            "loads": dict(self.load_counts),
+            "images": len(self._images),
+            "scaled": len(self._scaled),
+            "fonts": len(self._fonts),
+            "sounds": len(self._sounds),
+            "bytes_resident": resident,
+            "bytes_total": sum(resident.values()),
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            "assets: %d loads %s, %.1f MiB residentes %s",
+            sum(stats["loads"].values()),
+            stats["loads"],
+            stats["bytes_total"] / (1024 * 1024),
+            stats["bytes_resident"],
+        )
+
+
+assets = AssetRegistry()
+
+
+if __name__ == "__main__":
+    # relatório rápido: python asset_registry.py
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    assets.preload()
+    for kind, count in assets.stats()["loads"].items():
+        print(f"{kind:>6}: {count} carregados")
+    for kind, size in assets.bytes_resident().items():
+        print(f"{kind:>6}: {size / 1024:.1f} KiB")
+    pygame.quit()
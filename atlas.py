@@ -0,0 +1,234 @@
+import argparse
+import json
+import logging
+import mmap
+import os
+from typing import Dict, List, Sequence, Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+ATLAS_VERSION = 1
+# relativo à raiz do projeto; o build/ fica fora do git
+ATLAS_DIR = "build/atlas"
+ATLAS_INDEX = os.path.join(ATLAS_DIR, "atlas.json")
+# as folhas agrupam o que é usado junto: o menu abre sem tocar nos sprites
+# da partida, e a partida não precisa das artes do menu
+SHEETS: Sequence[Tuple[str, Tuple[str, ...]]] = (
+    ("sprites", ("player/", "ghost/")),
+    ("menu", ("menu/",)),
+)
+MAX_WIDTH = 2048
+PADDING = 1
+# ordem dos bytes de um pixel no formato "raw", igual à superfície que o
+# convert_alpha devolve (ARGB8888): a folha mapeada já sai convertida
+RAW_FORMAT = "BGRA"
+
+# (folha, x, y, largura, altura)
+Region = Tuple[str, int, int, int, int]
+
+
+def sheet_of(key: str) -> str:
+    for name, prefixes in SHEETS:
+        if key.startswith(prefixes):
+            return name
+    return "misc"
+
+
+def pack(
+    sizes: Dict[str, Tuple[int, int]],
+    max_width: int = MAX_WIDTH,
+    padding: int = PADDING,
+) -> Tuple[Tuple[int, int], Dict[str, Tuple[int, int]]]:
+    # empacotamento em prateleiras: do mais alto ao mais baixo, enchendo cada
+    # linha da esquerda para a direita. Para uma dúzia de imagens de tamanhos
+    # parecidos sobra pouco espaço e o resultado não muda entre builds
+    width = max(max_width, max(w for w, _ in sizes.values()) + padding)
+    order = sorted(sizes, key=lambda key: (-sizes[key][1], -sizes[key][0], key))
+
+    positions = {}
+    x = y = shelf = used = 0
+    for key in order:
+        w, h = sizes[key]
+        if x + w > width:
+            x, y = 0, y + shelf + padding
+            shelf = 0
+        positions[key] = (x, y)
+        x += w + padding
+        shelf = max(shelf, h)
+        used = max(used, x - padding)
+    return (used, y + shelf), positions
+
+
+def build(
+    images: Dict[str, str],
+    root: str,
+    output: str = ATLAS_DIR,
+    raw: bool = False,
+    max_width: int = MAX_WIDTH,
+    padding: int = PADDING,
+) -> dict:
+    # decodifica cada imagem uma vez, monta uma folha por grupo e grava as
+    # folhas (PNG ou pixels crus) e o índice atlas.json ao lado
+    os.makedirs(output, exist_ok=True)
+    groups: Dict[str, Dict[str, pygame.Surface]] = {}
+    sources = {}
+    for key, relative in images.items():
+        path = os.path.join(root, relative)
+        groups.setdefault(sheet_of(key), {})[key] = pygame.image.load(path)
+        sources[key] = [relative, os.stat(path).st_mtime_ns]
+
+    index = {
+        "version": ATLAS_VERSION,
+        "format": "raw" if raw else "png",
+        "pixel_format": RAW_FORMAT,
+        "sheets": {},
+        "sprites": {},
+        "sources": sources,
+    }
+    for name, surfaces in groups.items():
+        sizes = {key: surface.get_size() for key, surface in surfaces.items()}
+        size, positions = pack(sizes, max_width, padding)
+
+        sheet = pygame.Surface(size, pygame.SRCALPHA, 32)
+        for key, (x, y) in positions.items():
+            sheet.blit(surfaces[key], (x, y))
+            index["sprites"][key] = [name, x, y, *sizes[key]]
+
+        filename = f"{name}.{'raw' if raw else 'png'}"
+        if raw:
+            with open(os.path.join(output, filename), "wb") as file:
+                file.write(pygame.image.tobytes(sheet, RAW_FORMAT))
+        else:
+            pygame.image.save(sheet, os.path.join(output, filename))
+        index["sheets"][name] = {"file": filename, "size": list(size)}
+
+    with open(os.path.join(output, "atlas.json"), "w") as file:
+        json.dump(index, file, indent=1)
+    return index
+
+
+class Atlas:
+    # folhas geradas pelo build() acima. Cada folha é lida uma única vez, na
+    # primeira vez que um sprite dela é pedido, e os sprites são subsurfaces
+    # dela: nenhum pixel é copiado. No formato "raw" a folha é um mmap do
+    # arquivo, sem decodificar PNG.
+    directory: str
+    index: dict
+
+    def __init__(self, directory: str, index: dict):
+        self.directory = directory
+        self.index = index
+        self.sprites: Dict[str, Region] = {
+            key: tuple(region) for key, region in index["sprites"].items()
+        }
+        self.sheets: Dict[str, pygame.Surface] = {}
+        # folhas já convertidas para o formato da tela
+        self.converted: set = set()
+        self._maps: List[mmap.mmap] = []
+
+    @classmethod
+    def load(cls, path: str, root: str) -> "Atlas | None":
+        # None quando não há atlas ou quando ele ficou velho (uma imagem foi
+        # editada depois do build): o registro volta aos arquivos soltos
+        try:
+            with open(path) as file:
+                index = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.warning("atlas %s ilegível: %s", path, error)
+            return None
+
+        if index.get("version") != ATLAS_VERSION:
+            logger.warning("atlas %s de outra versão, refaça o build", path)
+            return None
+        for key, (relative, mtime) in index["sources"].items():
+            try:
+                stale = os.stat(os.path.join(root, relative)).st_mtime_ns != mtime
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                logger.warning("atlas %s desatualizado (%s), refaça o build", path, key)
+                return None
+        return cls(os.path.dirname(path), index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.sprites
+
+    def sheet(self, name: str) -> pygame.Surface:
+        # só decodifica: o loader chama daqui da thread dele, então a conversão
+        # fica para o convert() na thread principal
+        sheet = self.sheets.get(name)
+        if sheet is None:
+            info = self.index["sheets"][name]
+            path = os.path.join(self.directory, info["file"])
+            if self.index["format"] == "raw":
+                with open(path, "rb") as file:
+                    # ACCESS_COPY: as páginas só são lidas quando usadas e uma
+                    # escrita na superfície nunca chega ao arquivo
+                    pixels = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+                self._maps.append(pixels)
+                sheet = pygame.image.frombuffer(
+                    pixels, tuple(info["size"]), self.index["pixel_format"]
+                )
+            else:
+                sheet = pygame.image.load(path)
+            self.sheets[name] = sheet
+        return sheet
+
+    def sprite(self, key: str) -> pygame.Surface:
+        name, x, y, w, h = self.sprites[key]
+        return self.sheet(name).subsurface((x, y, w, h))
+
+    def convert(self, key: str) -> None:
+        # converte a folha do sprite key: uma conversão por folha, no lugar de
+        # um convert_alpha por imagem; só depois do set_mode e na thread
+        # principal. Os sprites pedidos antes disso continuam apontando para a
+        # folha antiga, então quem converte pede de novo
+        name = self.sprites[key][0]
+        if name in self.converted or pygame.display.get_surface() is None:
+            return
+        self.sheets[name] = self._convert(self.sheet(name))
+        self.converted.add(name)
+
+    def _convert(self, sheet: pygame.Surface) -> pygame.Surface:
+        # a folha "raw" já está no formato da tela e pode ficar no mmap
+        target = pygame.Surface((1, 1), pygame.SRCALPHA, 32).convert_alpha()
+        if sheet.get_masks() == target.get_masks():
+            return sheet
+        return sheet.convert_alpha()
+
+    def bytes_resident(self) -> int:
+        return sum(
+            sheet.get_pitch() * sheet.get_height() for sheet in self.sheets.values()
+        )
+
+
+if __name__ == "__main__":
+    from asset_registry import IMAGES, ROOT
+
+    parser = argparse.ArgumentParser(
+        description="empacota as imagens do jogo em folhas de atlas"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=os.path.join(ROOT, ATLAS_DIR),
+        help="pasta das folhas e do atlas.json",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help=f"grava os pixels crus ({RAW_FORMAT}), carregados por mmap sem decodificar",
+    )
+    parser.add_argument("--max-width", type=int, default=MAX_WIDTH)
+    parser.add_argument("--padding", type=int, default=PADDING)
+    args = parser.parse_args()
+
+    index = build(IMAGES, ROOT, args.output, args.raw, args.max_width, args.padding)
+    for name, info in index["sheets"].items():
+        count = sum(1 for region in index["sprites"].values() if region[0] == name)
+        width, height = info["size"]
+        print(f"{name:>8}: {count} imagens em {width}x{height} ({info['file']})")
@@ -0,0 +1,121 @@
+import logging
+import threading
+from typing import Dict, Sequence, Tuple
+
+import pygame
+
+from asset_registry import AssetRegistry, SilentSound, assets
+
+logger = logging.getLogger(__name__)
+
+# efeitos curtos, decodificados inteiros na memória
+EFFECTS = ("flash", "estatua_morre")
+EFFECT_VOLUME = 0.1
+# volume de cada música, tocada em streaming pelo pygame.mixer.music
+MUSIC_VOLUME = {
+    "menu": 0.2,
+    "bgm": 0.1,
+    "gameover": 0.2,
+}
+FADE_MS = 600
+
+
+class AudioManager:
+    # as músicas tocam em streaming pelo pygame.mixer.music, sem decodificar
+    # o arquivo inteiro, e os efeitos são carregados uma vez numa thread em
+    # segundo plano. Trocar de música faz fade out da atual e fade in da nova;
+    # como o mixer só tem um stream de música, o fade in começa quando o fade
+    # out termina, e quem dispara isso é o update() chamado a cada frame.
+    enabled: bool
+    fade_ms: int
+    current: str | None
+
+    def __init__(
+        self,
+        registry: AssetRegistry = assets,
+        effects: Sequence[str] = EFFECTS,
+        fade_ms: int = FADE_MS,
+        enabled: bool = True,
+    ):
+        self.registry = registry
+        self.effects = tuple(effects)
+        self.fade_ms = fade_ms
+        self.enabled = enabled
+        self.current = None
+
+        self._effects: Dict[str, pygame.mixer.Sound] = {}
+        self._loader: threading.Thread | None = None
+        self._pending: Tuple[str, int] | None = None
+        self._silent = SilentSound()
+
+    def ready(self) -> bool:
+        return self.enabled and pygame.mixer.get_init() is not None
+
+    def preload_effects(self) -> threading.Thread | None:
+        # pode ser chamado mais de uma vez, só a primeira carrega (e o que
+        # já foi carregado pelo loader.py é pulado)
+        if not self.ready() or self._loader is not None:
+            return self._loader
+        self._loader = threading.Thread(
+            target=self._load_effects, name="audio-preload", daemon=True
+        )
+        self._loader.start()
+        return self._loader
+
+    def _load_effects(self) -> None:
+        for key in self.effects:
+            self.load_effect(key)
+
+    def load_effect(self, key: str) -> None:
+        # também usado pelo carregamento em segundo plano do menu (loader.py)
+        if not self.ready() or key in self._effects:
+            return
+        try:
+            sound = self.registry.sound(key)
+        except (pygame.error, FileNotFoundError) as error:
+            logger.warning("efeito %s não carregou: %s", key, error)
+            return
+        sound.set_volume(EFFECT_VOLUME)
+        self._effects[key] = sound
+
+    def effect(self, key: str):
+        # enquanto a thread não terminou o efeito fica mudo, em vez de travar
+        # o frame decodificando o arquivo
+        return self._effects.get(key, self._silent)
+
+    def play(self, key: str) -> None:
+        if self.enabled:
+            self.effect(key).play()
+
+    def play_music(self, key: str, loops: int = -1) -> None:
+        if not self.ready() or key == self.current:
+            return
+        self.current = key
+        self._pending = (key, loops)
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(self.fade_ms)
+        self.update()
+
+    def stop_music(self) -> None:
+        if not self.ready():
+            return
+        self.current = None
+        self._pending = None
+        pygame.mixer.music.fadeout(self.fade_ms)
+
+    def update(self) -> None:
+        # chamado a cada frame: quando o fade out acaba, começa a próxima
+        if self._pending is None or pygame.mixer.music.get_busy():
+            return
+        key, loops = self._pending
+        self._pending = None
+        try:
+            pygame.mixer.music.load(self.registry.path(self.registry.music[key]))
+        except (pygame.error, FileNotFoundError) as error:
+            logger.warning("música %s não carregou: %s", key, error)
+            return
+        pygame.mixer.music.set_volume(MUSIC_VOLUME.get(key, 1.0))
+        pygame.mixer.music.play(loops, fade_ms=self.fade_ms)
+
+
+audio = AudioManager()
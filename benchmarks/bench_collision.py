@@ -0,0 +1,82 @@
+import argparse
+import sys
+import time
+
+import common
+
+from bench_queries import build
+from collision_masks import CollisionMasks
+from headless import create_game
+from main import GHOST_BASE_SIZE
+
+SIZES = (100, 1_000, 10_000)
+MODES = ("rect", "mask")
+
+
+def measure(count: int, rounds: int, seed: int) -> dict:
+    game = create_game(seed=seed)
+    game.ghosts = build(game, count)
+    masks = CollisionMasks(GHOST_BASE_SIZE)
+
+    # o visor anda pela tela, como no bench_queries
+    frames = []
+    for index in range(rounds):
+        game.frame.rect.center = (
+            150 + (500 * index // rounds),
+            100 + (400 * index // rounds),
+        )
+        frames.append(game.frame.rect.copy())
+
+    result = {"ghosts": count, "rounds": rounds, "query_us": {}, "hits": {}}
+    for mode in MODES:
+        game.masks = masks if mode == "mask" else None
+        # uma volta para montar as máscaras; a medição é com o cache quente
+        for rect in frames:
+            game.frame.rect = rect
+            game.captured()
+            game.touching_player()
+
+        captured = touching = 0
+        start = time.perf_counter()
+        for rect in frames:
+            game.frame.rect = rect
+            captured += len(game.captured())
+            touching += len(game.touching_player())
+        elapsed = time.perf_counter() - start
+        # as duas consultas de um frame: alvo no visor e contato com o jogador
+        result["query_us"][mode] = elapsed / (rounds * 2) * 1e6
+        result["hits"][mode] = {
+            "captured": captured / rounds,
+            "touching": touching / rounds,
+        }
+    result["masks"] = masks.stats()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="custo da colisão por retângulos e por máscaras de pixels"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="arquivo JSON (padrão: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.sizes:
+        result = measure(count, args.rounds, args.seed)
+        queries = ", ".join(
+            f"{mode} {result['query_us'][mode]:.1f} us "
+            f"({result['hits'][mode]['captured']:.1f} no visor, "
+            f"{result['hits'][mode]['touching']:.1f} no jogador)"
+            for mode in MODES
+        )
+        print(f"{count:>6} fantasmas: {queries}", file=sys.stderr)
+        results.append(result)
+
+    common.emit("collision", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
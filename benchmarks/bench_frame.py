@@ -0,0 +1,105 @@
+import argparse
+import sys
+import time
+
+import common
+
+from headless import create_game
+from particles import ParticleSystem
+from main import Vector2
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def sweep_script(frames: int = 240, click_every: int = 45):
+    # o visor varre a tela de um lado ao outro, clicando de tempos em tempos
+    script = []
+    for frame in range(frames):
+        x = 150 + (500 * frame // frames)
+        script.append(((x, 250), frame % click_every == 0))
+    return script
+
+
+def populate(game, count: int) -> None:
+    width, height = game.screen.get_size()
+    for _ in range(count):
+        game.ghosts.spawn(
+            position=Vector2(game.rng.uniform(0, width), game.rng.uniform(0, height)),
+            distance=game.rng.uniform(1.1, 1.5),
+            buff=game.rng.randint(0, 2),
+            type=game.rng.randint(0, 2),
+            player_position=game.player.position,
+            rng=game.rng,
+        )
+    # partículas eternas, para medir o pool cheio em todos os frames
+    game.particulas = ParticleSystem(
+        game.screen.get_rect(), capacity=count, lifetime=float("inf")
+    )
+    for _ in range(count):
+        pos = (game.rng.uniform(0, width), game.rng.uniform(0, height))
+        game.particulas.emit(pos, rng=game.rng)
+    # o jogador não morre durante a medição
+    game.invulnerabilidade_timer = float("inf")
+
+
+def measure(count: int, frames: int, warmup: int, seed: int, engine: str) -> dict:
+    game = create_game(seed=seed, script=sweep_script(), ghost_engine=engine)
+    populate(game, count)
+
+    update_ms = []
+    draw_ms = []
+    for frame in range(warmup + frames):
+        start = time.perf_counter()
+        game.handle_events()
+        game.update(game.fixed_dt)
+        middle = time.perf_counter()
+        game.draw()
+        end = time.perf_counter()
+
+        if frame >= warmup:
+            update_ms.append((middle - start) * 1000)
+            draw_ms.append((end - middle) * 1000)
+
+    return {
+        "engine": engine,
+        "ghosts": count,
+        "particles": count,
+        "frames": frames,
+        "seed": seed,
+        "ghosts_alive_at_end": len(game.ghosts),
+        "update_ms": common.summarize(update_ms),
+        "draw_ms": common.summarize(draw_ms),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="tempo de update e draw por frame com N fantasmas e partículas"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--engine", choices=("list", "numpy"), nargs="+", default=["list"]
+    )
+    parser.add_argument("--output", "-o", help="arquivo JSON (padrão: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for engine in args.engine:
+        for count in args.sizes:
+            result = measure(count, args.frames, args.warmup, args.seed, engine)
+            print(
+                f"{engine:>5} {count:>6} fantasmas: "
+                f"update {result['update_ms']['mean']:.3f} ms, "
+                f"draw {result['draw_ms']['mean']:.3f} ms",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+    common.emit("frame", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import sys
+import time
+
+import common
+
+from ghost_engine import GhostEngine, np
+from headless import create_game
+from main import GhostList, Vector2, ghost_sprites, ghost_types
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def linear(ghosts, rect):
+    # como o Game.update fazia antes: um colliderect por fantasma
+    return [ghost for ghost in ghosts if ghost.hitbox.colliderect(rect)]
+
+
+def collidelistall(ghosts, rect):
+    hitboxes = [ghost.hitbox for ghost in ghosts]
+    return [ghosts[index] for index in rect.collidelistall(hitboxes)]
+
+
+STRATEGIES = {
+    "linear": linear,
+    "collidelistall": collidelistall,
+}
+
+
+def build(
+    game, count: int, ghosts: GhostList | GhostEngine | None = None
+) -> GhostList | GhostEngine:
+    width, height = game.screen.get_size()
+    if ghosts is None:
+        ghosts = GhostList()
+    for _ in range(count):
+        ghosts.spawn(
+            position=Vector2(game.rng.uniform(0, width), game.rng.uniform(0, height)),
+            distance=game.rng.uniform(1.1, 1.5),
+            buff=game.rng.randint(0, 2),
+            type=game.rng.randint(0, 2),
+            player_position=game.player.position,
+            rng=game.rng,
+        )
+    return ghosts
+
+
+def measure(count: int, rounds: int, seed: int) -> dict:
+    game = create_game(seed=seed)
+    ghosts = build(game, count)
+
+    # as três consultas de um frame: contato com o jogador, alvo no visor e
+    # dano no clique, com o visor andando pela tela
+    frames = []
+    for index in range(rounds):
+        game.frame.rect.center = (
+            150 + (500 * index // rounds),
+            100 + (400 * index // rounds),
+        )
+        frames.append(game.frame.rect.copy())
+    player = game.player.hitbox
+
+    result = {"ghosts": count, "rounds": rounds, "query_us": {}}
+    for name, strategy in STRATEGIES.items():
+        start = time.perf_counter()
+        for rect in frames:
+            strategy(ghosts, player)
+            strategy(ghosts, rect)
+            strategy(ghosts, rect)
+        elapsed = time.perf_counter() - start
+        result["query_us"][name] = elapsed / (rounds * 3) * 1e6
+
+    # para comparar: atualizar os fantasmas no mesmo frame custa bem mais que
+    # as três consultas, então um índice espacial que precise ser avisado a
+    # cada movimento não se paga
+    offset = Vector2(0, 0)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ghosts.update_all(1 / 60, offset, game.player.position)
+    result["update_us"] = (time.perf_counter() - start) / rounds * 1e6
+
+    if np is not None:
+        result["engine_frame_us"] = measure_engine(game, count, frames, rounds)
+    return result
+
+
+def measure_engine(game, count: int, frames, rounds: int) -> dict:
+    # no GhostEngine a grade é refeita uma vez por passo, então cada frame
+    # paga a reconstrução mais as três consultas; sem a grade, cada consulta
+    # é uma máscara sobre todos os fantasmas
+    engine = build(
+        game,
+        count,
+        GhostEngine(ghost_sprites, ghost_types, bounds=game.screen.get_rect()),
+    )
+    player = game.player.hitbox
+    result = {}
+    for name, threshold in (("mask", count + 1), ("grid", 0)):
+        engine.grid_min_ghosts = threshold
+        start = time.perf_counter()
+        for rect in frames:
+            # como se os fantasmas tivessem andado desde o último frame
+            engine._grid_dirty = True
+            engine.colliding(player)
+            engine.contained_in(rect)
+            engine.contained_in(rect)
+        result[name] = (time.perf_counter() - start) / rounds * 1e6
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="custo das consultas de colisão por quantidade de fantasmas"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="arquivo JSON (padrão: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.sizes:
+        result = measure(count, args.rounds, args.seed)
+        queries = ", ".join(
+            f"{name} {value:.1f} us" for name, value in result["query_us"].items()
+        )
+        print(f"{count:>6} fantasmas: {queries}", file=sys.stderr)
+        if "engine_frame_us" in result:
+            engine = ", ".join(
+                f"{name} {value:.1f} us"
+                for name, value in result["engine_frame_us"].items()
+            )
+            print(f"{'':>6} numpy, por frame: {engine}", file=sys.stderr)
+        results.append(result)
+
+    common.emit("queries", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+import os
+import platform
+import sys
+from typing import List, Sequence
+
+# os benchmarks rodam como scripts (uv run benchmarks/bench_frame.py), então
+# a raiz do projeto precisa entrar no path para importar main e companhia
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import headless  # noqa: E402
+
+headless.setup()
+
+import pygame  # noqa: E402
+
+
+def summarize(samples_ms: Sequence[float]) -> dict:
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "max": ordered[-1],
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def emit(benchmark: str, results: List[dict], output: str | None) -> None:
+    # resultado em JSON, para comparar entre builds e pegar regressões
+    document = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+    if output is None or output == "-":
+        print(text)
+    else:
+        with open(output, "w") as file:
+            file.write(text + "\n")
@@ -0,0 +1,116 @@
+from typing import Dict, Tuple
+
+import pygame
+
+from ghost_types import GhostType
+from sprite_cache import GhostSpriteCache
+
+# largura das faixas de distância das máscaras: a mesma do nível de
+# qualidade mais alto, fixa durante toda a partida
+BAND_STEP = 0.02
+
+# chave: (tipo de fantasma da tabela, faixa de distância)
+MaskKey = Tuple[GhostType, int]
+
+
+class CollisionMasks:
+    # colisão precisa (--pixel-collision): máscaras dos pixels opacos de cada
+    # sprite, no tamanho em que ele é desenhado. Só entram depois que os
+    # retângulos já se tocam (o broadphase de sempre), então custam um teste
+    # de máscara por fantasma perto do jogador ou do visor.
+    #
+    # As máscaras dos fantasmas são a máscara da imagem base escalada para
+    # cada faixa de distância, sem escalar nenhuma surface. As faixas têm
+    # largura fixa e não seguem o cache de sprites do draw: o quality.py
+    # alarga as faixas dele durante a partida, e a colisão não pode mudar
+    # com o nível de qualidade (replay e sementes dão o mesmo resultado).
+    # São poucas (tipos x cores x faixas), então o cache não tem LRU: só
+    # recomeça se passar da capacidade.
+    bands: GhostSpriteCache
+    capacity: int
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        base_size: float,
+        band_step: float = BAND_STEP,
+        capacity: int = 1024,
+    ):
+        # só mede tamanhos e faixas, nunca guarda sprites
+        self.bands = GhostSpriteCache(base_size, band_step)
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        # máscara e caixa dos pixels opacos, relativa ao topo esquerdo
+        self._ghosts: Dict[MaskKey, Tuple[pygame.Mask, pygame.Rect]] = {}
+        # id da imagem base -> (imagem, máscara); a imagem fica guardada para
+        # o id não ser reaproveitado
+        self._bases: Dict[int, Tuple[pygame.Surface, pygame.Mask]] = {}
+        self._players: Dict[Tuple[int, int], Tuple[pygame.Surface, pygame.Mask]] = {}
+
+    def base(self, image: pygame.Surface) -> pygame.Mask:
+        entry = self._bases.get(id(image))
+        if entry is None:
+            entry = self._bases[id(image)] = (image, pygame.mask.from_surface(image))
+        return entry[1]
+
+    def ghost(self, ghost) -> Tuple[pygame.Mask, pygame.Rect]:
+        bands = self.bands
+        kind = ghost.kind
+        distance = ghost.distance
+        key = (kind, bands.band(distance))
+        entry = self._ghosts.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if len(self._ghosts) >= self.capacity:
+            self._ghosts.clear()
+        image = kind.image
+        size, _ = bands.measure(image, distance)
+        mask = self.base(image).scale(size)
+        # uma caixa por pedaço conectado; a caixa de todos é a união
+        rects = mask.get_bounding_rects()
+        bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        entry = self._ghosts[key] = (mask, bounds)
+        return entry
+
+    def player(self, image: pygame.Surface, radius: int) -> pygame.Mask:
+        # só a parte da imagem dentro da hitbox do jogador (o quadrado de
+        # lado 2 * radius no centro): a precisão tira os cantos vazios da
+        # hitbox, mas não aumenta o alcance dos fantasmas
+        key = (id(image), radius)
+        entry = self._players.get(key)
+        if entry is None:
+            crop = pygame.Mask((radius * 2, radius * 2))
+            width, height = image.get_size()
+            crop.draw(self.base(image), (radius - width // 2, radius - height // 2))
+            entry = self._players[key] = (image, crop)
+        return entry[1]
+
+    def contained(self, ghost, rect: pygame.Rect) -> bool:
+        # todos os pixels opacos dentro do retângulo
+        _, bounds = self.ghost(ghost)
+        return rect.contains(bounds.move(ghost.hitbox.topleft))
+
+    def touches(self, ghost, mask: pygame.Mask, topleft: Tuple[int, int]) -> bool:
+        ghost_mask, _ = self.ghost(ghost)
+        x, y = ghost.hitbox.topleft
+        return mask.overlap(ghost_mask, (x - topleft[0], y - topleft[1])) is not None
+
+    def clear(self) -> None:
+        self._ghosts.clear()
+        self._bases.clear()
+        self._players.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ghost_masks": len(self._ghosts),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,49 @@
+import pygame
+
+OVERLAY_ALPHA = 180
+# escurecer com alpha 180 é o mesmo que multiplicar o rgb por (255 - 180) / 255
+OVERLAY_MULTIPLIER = (255 - OVERLAY_ALPHA,) * 3
+
+
+class Compositor:
+    # camadas de tela cheia da câmera (escurecimento fora do frame e flash),
+    # feitas com fills em modo de blend direto na tela, sem nenhuma surface
+    # intermediária.
+    fast_flash: bool
+
+    def __init__(self):
+        # qualidade baixa (quality.py): o flash vira um fill só
+        self.fast_flash = False
+
+    def draw_overlay(self, screen: pygame.Surface, hole: pygame.Rect) -> None:
+        for rect in self.around(screen.get_rect(), hole):
+            screen.fill(OVERLAY_MULTIPLIER, rect, pygame.BLEND_RGB_MULT)
+
+    def draw_flash(self, screen: pygame.Surface, alpha: float) -> None:
+        alpha = int(alpha)
+        if alpha <= 0:
+            return
+
+        if self.fast_flash:
+            # metade do trabalho: só soma, sem escurecer antes; as áreas
+            # claras estouram para branco um pouco antes que no blend exato
+            screen.fill((alpha,) * 3, special_flags=pygame.BLEND_RGB_ADD)
+            return
+
+        # dst + (255 - dst) * a / 255 == dst * (255 - a) / 255 + a
+        screen.fill((255 - alpha,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+        screen.fill((alpha,) * 3, special_flags=pygame.BLEND_RGB_ADD)
+
+    @staticmethod
+    def around(bounds: pygame.Rect, hole: pygame.Rect):
+        # os até quatro retângulos de bounds que ficam fora do buraco
+        hole = hole.clip(bounds)
+        if not hole:
+            yield bounds
+            return
+        yield pygame.Rect(bounds.left, bounds.top, bounds.width, hole.top - bounds.top)
+        yield pygame.Rect(
+            bounds.left, hole.bottom, bounds.width, bounds.bottom - hole.bottom
+        )
+        yield pygame.Rect(bounds.left, hole.top, hole.left - bounds.left, hole.height)
+        yield pygame.Rect(hole.right, hole.top, bounds.right - hole.right, hole.height)
@@ -0,0 +1,72 @@
+from typing import Dict, Hashable, List
+
+import pygame
+
+from display import Display, display as default_display
+
+# acima dessa fração da tela, atualizar tudo com flip sai mais barato
+DEFAULT_THRESHOLD = 0.5
+
+
+class DirtyRectRenderer:
+    # envia para a tela só as regiões que mudaram: o retângulo anterior e o
+    # atual de cada coisa desenhada. A cena continua sendo desenhada inteira
+    # na surface, o que se economiza é a apresentação.
+    bounds: pygame.Rect
+    threshold: float
+    full_updates: int
+    partial_updates: int
+
+    def __init__(
+        self,
+        bounds: pygame.Rect,
+        threshold: float = DEFAULT_THRESHOLD,
+        display: Display = default_display,
+    ):
+        self.bounds = bounds.copy()
+        self.display = display
+        self.threshold = threshold
+        self.full_updates = 0
+        self.partial_updates = 0
+        self._previous: Dict[Hashable, pygame.Rect] = {}
+        self._needs_full = True
+
+    def invalidate(self) -> None:
+        self._needs_full = True
+
+    def present(self, rects: Dict[Hashable, pygame.Rect], full: bool = False) -> None:
+        # cada retângulo vem com uma chave do objeto desenhado, para juntar a
+        # posição anterior e a atual do mesmo objeto num retângulo só
+        current = {}
+        for key, rect in rects.items():
+            rect = rect.clip(self.bounds)
+            if rect:
+                current[key] = rect
+
+        dirty: List[pygame.Rect] = []
+        for key, rect in current.items():
+            previous = self._previous.pop(key, None)
+            if previous is None:
+                dirty.append(rect)
+            elif previous.colliderect(rect):
+                dirty.append(previous.union(rect))
+            else:
+                dirty.append(previous)
+                dirty.append(rect)
+        # o que sumiu desde o último frame também precisa ser apagado da tela
+        dirty.extend(self._previous.values())
+        self._previous = current
+
+        area = sum(rect.width * rect.height for rect in dirty)
+        if (
+            full
+            or self._needs_full
+            or area > self.threshold * self.bounds.width * self.bounds.height
+        ):
+            self._needs_full = False
+            self.full_updates += 1
+            self.display.present()
+            return
+
+        self.partial_updates += 1
+        self.display.present(dirty)
@@ -0,0 +1,242 @@
+import logging
+import math
+import warnings
+from typing import List, Sequence, Tuple
+
+import pygame
+from pygame._sdl2 import video
+
+logger = logging.getLogger(__name__)
+
+# resolução lógica de todas as cenas: tudo é desenhado nela e escalado uma
+# vez para a janela. 960x540 é a proporção do menu e cabe inteira em 1080p
+# (2x) e 4K (4x)
+LOGICAL_SIZE = (960, 540)
+TITLE = "Projeto IP"
+# "surface": tudo em surfaces, apresentado pelo pygame.display; "texture":
+# janela com um Renderer do SDL e a partida desenhada com texturas
+# (texture_renderer.py)
+BACKENDS = ("surface", "texture")
+
+
+class Display:
+    # uma janela para o jogo inteiro e um backbuffer do tamanho lógico, onde
+    # menu, partida e game over desenham. No modo normal o pygame.SCALED faz a
+    # escala na GPU (e o SDL já devolve mouse e eventos em coordenadas
+    # lógicas); se o SCALED não abrir, o backbuffer é uma surface à parte,
+    # escalada com um transform.scale por frame, e as posições do mouse são
+    # convertidas aqui. No backend "texture" a janela é do pygame._sdl2: a
+    # partida desenha direto no Renderer e as cenas do menu continuam no
+    # backbuffer, enviado como textura a cada present.
+    logical_size: Tuple[int, int]
+    window_size: Tuple[int, int] | None
+    fullscreen: bool
+    vsync: bool
+    software: bool
+    backend: str
+
+    def __init__(
+        self,
+        logical_size: Tuple[int, int] = LOGICAL_SIZE,
+        window_size: Tuple[int, int] | None = None,
+        fullscreen: bool = False,
+        vsync: bool = False,
+        software: bool = False,
+        backend: str = "surface",
+    ):
+        self.logical_size = tuple(logical_size)
+        self.window_size = tuple(window_size) if window_size else None
+        self.fullscreen = fullscreen
+        self.vsync = vsync
+        self.software = software
+        self.backend = backend
+
+        self.window: pygame.Surface | video.Window | None = None
+        self.renderer: video.Renderer | None = None
+        self._frame: video.Texture | None = None
+        self.surface: pygame.Surface | None = None
+        # janela com pygame.SCALED: o SDL escala e reenvia a tela inteira
+        self.sdl_scaled = False
+        # onde o backbuffer vai parar dentro da janela (com tarjas pretas
+        # quando a proporção não bate)
+        self.viewport = pygame.Rect((0, 0), self.logical_size)
+
+    def open(self, vsync: bool | None = None) -> pygame.Surface:
+        # devolve o backbuffer; a janela só é recriada se o vsync mudar
+        if vsync is not None and vsync != self.vsync:
+            self.vsync = vsync
+            self.close()
+        if self.renderer is not None or (
+            self.surface is not None and pygame.display.get_surface() is self.window
+        ):
+            return self.surface
+
+        if self.backend == "texture":
+            self._open_renderer()
+            return self.surface
+        if not self.software:
+            try:
+                self._open_scaled()
+                return self.surface
+            except pygame.error as error:
+                logger.warning(
+                    "SCALED indisponível (%s), escalando por software", error
+                )
+                self.software = True
+        self._open_software()
+        return self.surface
+
+    def close(self) -> None:
+        if self.renderer is not None:
+            self.window.destroy()
+            self.renderer = None
+            self._frame = None
+        self.window = None
+        self.sdl_scaled = False
+        self.surface = None
+
+    def _open_renderer(self) -> None:
+        self.window = video.Window(
+            TITLE,
+            self.window_size or self.logical_size,
+            fullscreen_desktop=self.fullscreen,
+            resizable=True,
+        )
+        try:
+            self.renderer = video.Renderer(self.window, accelerated=1, vsync=self.vsync)
+        except video.error as error:
+            # sem aceleração, o driver "software" do SDL faz o mesmo trabalho
+            logger.warning(
+                "renderer acelerado indisponível (%s), usando software", error
+            )
+            self.renderer = video.Renderer(self.window, accelerated=0)
+        # o SDL escala do tamanho lógico para a janela e converte os eventos
+        # de mouse; só o mouse.get_pos precisa ser convertido aqui
+        self.renderer.logical_size = self.logical_size
+        self.surface = pygame.Surface(self.logical_size)
+
+    def _open_scaled(self) -> None:
+        flags = pygame.SCALED | pygame.RESIZABLE
+        if self.fullscreen:
+            flags |= pygame.FULLSCREEN
+        self.window = pygame.display.set_mode(
+            self.logical_size, flags, vsync=int(self.vsync)
+        )
+        if self.window_size is not None and not self.fullscreen:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                pygame.Window.from_display_module().size = self.window_size
+        self.surface = self.window
+        self.viewport = self.window.get_rect()
+        self.sdl_scaled = True
+
+    def _open_software(self) -> None:
+        flags = pygame.FULLSCREEN if self.fullscreen else 0
+        size = (0, 0) if self.fullscreen else self.window_size or self.logical_size
+        self.window = pygame.display.set_mode(size, flags)
+        if self.window.get_size() == self.logical_size:
+            # sem escala: desenha direto na janela
+            self.surface = self.window
+            self.viewport = self.window.get_rect()
+            return
+
+        self.surface = pygame.Surface(self.logical_size).convert()
+        self.viewport = self.letterbox(self.window.get_size())
+        self.window.fill("black")
+
+    def letterbox(self, window_size: Tuple[int, int]) -> pygame.Rect:
+        # maior retângulo com a proporção lógica, centralizado na janela
+        width, height = window_size
+        scale = min(width / self.logical_size[0], height / self.logical_size[1])
+        viewport = pygame.Rect(
+            0, 0, int(self.logical_size[0] * scale), int(self.logical_size[1] * scale)
+        )
+        viewport.center = (width // 2, height // 2)
+        return viewport
+
+    @property
+    def scaling(self) -> bool:
+        return self.surface is not None and self.surface is not self.window
+
+    @property
+    def partial_present(self) -> bool:
+        # se o present(rects) envia só as regiões pedidas. Com o
+        # pygame.SCALED o update de regiões vira um flip, e o renderer sempre
+        # desenha o frame inteiro
+        return self.renderer is None and not self.sdl_scaled
+
+    def to_window(self, rect: pygame.Rect) -> pygame.Rect:
+        # região do backbuffer -> região da janela que a cobre inteira
+        scale_x = self.viewport.w / self.logical_size[0]
+        scale_y = self.viewport.h / self.logical_size[1]
+        left = self.viewport.x + math.floor(rect.left * scale_x)
+        top = self.viewport.y + math.floor(rect.top * scale_y)
+        right = self.viewport.x + math.ceil(rect.right * scale_x)
+        bottom = self.viewport.y + math.ceil(rect.bottom * scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def present(self, rects: Sequence[pygame.Rect] | None = None) -> None:
+        # rects: só essas regiões mudaram (ver DirtyRectRenderer)
+        if self.renderer is not None:
+            if self._frame is None:
+                self._frame = video.Texture(
+                    self.renderer, self.logical_size, streaming=True
+                )
+            self._frame.update(self.surface)
+            self.renderer.draw_color = (0, 0, 0, 255)
+            self.renderer.clear()
+            self._frame.draw()
+            self.renderer.present()
+        elif self.scaling and rects is None:
+            pygame.transform.scale(
+                self.surface, self.viewport.size, self.window.subsurface(self.viewport)
+            )
+            pygame.display.flip()
+        elif self.scaling:
+            # só as regiões sujas são escaladas e enviadas
+            bounds = self.surface.get_rect()
+            window_rects = []
+            for rect in rects:
+                rect = rect.clip(bounds)
+                if not rect:
+                    continue
+                target = self.to_window(rect).clip(self.viewport)
+                pygame.transform.scale(
+                    self.surface.subsurface(rect),
+                    target.size,
+                    self.window.subsurface(target),
+                )
+                window_rects.append(target)
+            pygame.display.update(window_rects)
+        elif rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def to_logical(self, position: Sequence[float]) -> Tuple[int, int]:
+        if not self.scaling:
+            return int(position[0]), int(position[1])
+        viewport = self.viewport
+        if self.renderer is not None:
+            # a janela do renderer pode ter sido redimensionada
+            viewport = self.letterbox(self.window.size)
+        x = (position[0] - viewport.x) * self.logical_size[0] / viewport.w
+        y = (position[1] - viewport.y) * self.logical_size[1] / viewport.h
+        return int(x), int(y)
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def events(self) -> List[pygame.event.Event]:
+        return [self.map_event(event) for event in pygame.event.get()]
+
+    def map_event(self, event: pygame.event.Event) -> pygame.event.Event:
+        # eventos de mouse com a posição em coordenadas lógicas (com o
+        # renderer, o SDL já entrega assim)
+        if self.scaling and self.renderer is None and hasattr(event, "pos"):
+            attributes = dict(event.dict, pos=self.to_logical(event.pos))
+            return pygame.event.Event(event.type, attributes)
+        return event
+
+
+display = Display()
@@ -0,0 +1,110 @@
+import time
+from typing import List, Sequence, Tuple
+
+import pygame
+
+from display import display
+
+# um frame de roteiro: posição do mouse e se houve clique esquerdo
+ScriptFrame = Tuple[Tuple[int, int], bool]
+
+# eventos que a partida trata, mais os de janela (o SCALED e o renderer
+# dependem deles). O resto, principalmente o MOUSEMOTION, um por movimento
+# do mouse, nem entra na fila durante a partida
+GAME_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.ACTIVEEVENT,
+    pygame.VIDEORESIZE,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWHIDDEN,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWMOVED,
+    pygame.WINDOWRESIZED,
+    pygame.WINDOWSIZECHANGED,
+    pygame.WINDOWMINIMIZED,
+    pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWENTER,
+    pygame.WINDOWLEAVE,
+    pygame.WINDOWFOCUSGAINED,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWCLOSE,
+    pygame.WINDOWDISPLAYCHANGED,
+)
+
+
+def restrict_events(allowed: Sequence[int] = GAME_EVENTS) -> None:
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(allowed)
+
+
+def allow_all_events() -> None:
+    # o menu e o game over voltam a receber tudo
+    pygame.event.set_allowed(None)
+
+
+class PygameInput:
+    # entrada ao vivo, direto da fila de eventos e do mouse do pygame, com as
+    # posições em coordenadas lógicas. Cada evento leva em .time o
+    # perf_counter de quando saiu da fila do SDL; o loop chama poll durante a
+    # espera entre frames, para esse carimbo ficar a ~1 ms do clique
+    def __init__(self):
+        self._pending: List[pygame.event.Event] = []
+
+    def poll(self) -> bool:
+        # True quando chegou um clique (ou QUIT): o loop para de esperar e
+        # começa o frame já
+        events = display.events()
+        if not events:
+            return False
+        now = time.perf_counter()
+        urgent = False
+        for event in events:
+            event.time = now
+            urgent = urgent or event.type in (pygame.MOUSEBUTTONDOWN, pygame.QUIT)
+        self._pending.extend(events)
+        return urgent
+
+    def events(self) -> List[pygame.event.Event]:
+        self.poll()
+        events, self._pending = self._pending, []
+        return events
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return display.mouse_pos()
+
+
+class ScriptedInput:
+    # entrada roteirizada, um ScriptFrame por frame do jogo. Ao fim do roteiro
+    # recomeça do início (loop=True) ou fecha o jogo com um QUIT.
+    frames: Sequence[ScriptFrame]
+    loop: bool
+    frame: int
+
+    def __init__(self, frames: Sequence[ScriptFrame], loop: bool = True):
+        self.frames = frames
+        self.loop = loop
+        self.frame = -1
+        self._pos = frames[0][0] if frames else (0, 0)
+
+    def events(self) -> List[pygame.event.Event]:
+        self.frame += 1
+        if self.frame >= len(self.frames):
+            if not self.loop or not self.frames:
+                return [pygame.event.Event(pygame.QUIT)]
+            self.frame = 0
+
+        self._pos, clicked = self.frames[self.frame]
+        if not clicked:
+            return []
+        return [
+            pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, button=pygame.BUTTON_LEFT, pos=self._pos
+            )
+        ]
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return self._pos
@@ -0,0 +1,77 @@
+import time
+from typing import Callable
+
+import pygame
+
+# no máximo esse tempo de frame entra no acumulador (ex.: janela arrastada)
+MAX_FRAME_TIME = 0.25
+# intervalo entre as leituras da entrada enquanto o loop espera o frame
+POLL_INTERVAL = 0.001
+
+
+class FixedTimestepLoop:
+    # a simulação avança sempre em passos de dt fixo, independente do fps.
+    # O que sobra no acumulador vira o alpha para interpolar o desenho entre
+    # o estado anterior e o atual.
+    dt: float
+    max_fps: int
+    max_steps: int
+    accumulator: float
+    dropped_time: float
+
+    def __init__(
+        self,
+        sim_rate: int = 60,
+        max_fps: int = 60,
+        max_steps: int = 5,
+        clock: pygame.time.Clock | None = None,
+    ):
+        self.dt = 1.0 / sim_rate
+        self.max_fps = max_fps
+        self.max_steps = max_steps
+        self.clock = clock or pygame.time.Clock()
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+        self._last_tick = time.perf_counter()
+
+    def tick(self, poll: Callable[[], bool] | None = None) -> float:
+        # max_fps == 0 desliga o limitador. Com poll, a espera até o próximo
+        # frame é feita em fatias curtas chamando poll, para a entrada ser
+        # lida assim que chega; se poll devolve True (um clique), o frame
+        # começa na hora em vez de esperar o fim da fatia de tempo
+        max_fps = self.max_fps
+        if poll is not None and max_fps:
+            deadline = self._last_tick + 1.0 / max_fps
+            while deadline - time.perf_counter() > POLL_INTERVAL:
+                if poll():
+                    max_fps = 0
+                    break
+                time.sleep(POLL_INTERVAL)
+        frame_time = self.clock.tick(max_fps) / 1000.0
+        self._last_tick = time.perf_counter()
+        return frame_time
+
+    def advance(self, frame_time: float) -> int:
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.accumulator -= self.dt
+            steps += 1
+
+        # espiral da morte: se a simulação não alcança o tempo real, o atraso
+        # é descartado em vez de acumular para os próximos frames
+        if self.accumulator >= self.dt:
+            dropped = self.accumulator - self.accumulator % self.dt
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.dt
+
+    @property
+    def fps(self) -> float:
+        return self.clock.get_fps()
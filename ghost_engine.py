@@ -0,0 +1,402 @@
+import random
+from typing import Dict, List, Tuple
+
+import pygame
+
+from display import LOGICAL_SIZE
+from ghost_types import GhostType, GhostTypes
+from spatial_grid import SpatialGrid, overlap
+from sprite_cache import GhostSpriteCache
+
+try:
+    import numpy as np
+except ImportError:  # o numpy é opcional (uv sync --extra fast)
+    np = None
+
+HIT_COOLDOWN_MAX = 1.0  # tempo que fica parado ao levar dano (em segundos)
+# abaixo disso, as três máscaras de um frame sobre todos os fantasmas saem
+# mais baratas que refazer a grade a cada passo (benchmarks/bench_queries.py)
+GRID_MIN_GHOSTS = 10_000
+
+
+class GhostView:
+    # visão fina sobre um slot do GhostEngine, com a mesma interface do Ghost;
+    # nada é copiado, tudo é lido e escrito direto nos arrays
+    __slots__ = ("engine", "slot")
+
+    def __init__(self, engine: "GhostEngine", slot: int):
+        self.engine = engine
+        self.slot = slot
+
+    @property
+    def type(self) -> int:
+        return int(self.engine.type[self.slot])
+
+    @property
+    def buff(self) -> int:
+        return int(self.engine.buff[self.slot])
+
+    @property
+    def hp(self) -> int:
+        return int(self.engine.hp[self.slot])
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self.engine.hp[self.slot] = value
+
+    @property
+    def distance(self) -> float:
+        return float(self.engine.distance[self.slot])
+
+    @distance.setter
+    def distance(self, value: float) -> None:
+        self.engine.set_distance(self.slot, value)
+
+    @property
+    def parallax_factor(self) -> float:
+        return 1.0 / self.distance
+
+    @property
+    def logical_position(self) -> pygame.Vector2:
+        return pygame.Vector2(*self.engine.position[self.slot])
+
+    @logical_position.setter
+    def logical_position(self, value) -> None:
+        self.engine.position[self.slot] = (value[0], value[1])
+
+    @property
+    def velocity(self) -> pygame.Vector2:
+        return pygame.Vector2(*self.engine.velocity[self.slot])
+
+    @property
+    def hitbox(self) -> pygame.Rect:
+        x, y = self.engine.topleft[self.slot]
+        size = self.engine.size[self.slot]
+        return pygame.Rect(int(x), int(y), int(size), int(size))
+
+    @property
+    def previous_topleft(self) -> pygame.Vector2:
+        return pygame.Vector2(*self.engine.previous_topleft[self.slot])
+
+    @property
+    def base_speed(self) -> float:
+        return float(self.engine.base_speed[self.slot])
+
+    @property
+    def current_speed(self) -> float:
+        return float(self.engine.current_speed[self.slot])
+
+    @property
+    def is_hit(self) -> bool:
+        return bool(self.engine.is_hit[self.slot])
+
+    @property
+    def hit_cooldown(self) -> float:
+        return float(self.engine.hit_cooldown[self.slot])
+
+    @property
+    def kind(self) -> GhostType:
+        return self.engine.kinds[self.slot]
+
+    @property
+    def base_image(self) -> pygame.Surface:
+        return self.engine.kinds[self.slot].image
+
+    @property
+    def player_position(self):
+        return self.engine.player_position
+
+    @player_position.setter
+    def player_position(self, value) -> None:
+        # todos os fantasmas do engine perseguem a mesma posição
+        self.engine.player_position = value
+
+    def take_damage(self, amount: int) -> None:
+        self.engine.damage(np.array([self.slot]), amount)
+
+    def update(self, dt: float, offset) -> None:
+        self.engine.update_all(
+            dt, offset, self.engine.player_position, np.array([self.slot])
+        )
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        return self.engine.draw_all(screen, alpha, np.array([self.slot]))[self]
+
+
+class GhostEngine:
+    # fantasmas em struct-of-arrays: cada atributo é um array do NumPy indexado
+    # pelo slot do fantasma, e movimento, aproximação, cooldown de dano e
+    # parallax rodam como operações em lote. Tem a mesma interface do
+    # GhostList do main.py; cada fantasma é exposto como um GhostView.
+    capacity: int
+    grid_min_ghosts: int
+    player_position: Tuple[float, float] | None
+
+    def __init__(
+        self,
+        sprites: GhostSpriteCache,
+        types: GhostTypes,
+        capacity: int = 64,
+        bounds: pygame.Rect | None = None,
+    ):
+        if np is None:
+            raise RuntimeError(
+                "o GhostEngine precisa do numpy, instale com: uv sync --extra fast"
+            )
+        self.sprites = sprites
+        self.types = types
+        self.base_size = sprites.base_size
+        self.player_position = None
+
+        self.capacity = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.type = np.zeros(0, dtype=np.int8)
+        self.buff = np.zeros(0, dtype=np.int8)
+        self.hp = np.zeros(0, dtype=np.int32)
+        self.distance = np.zeros(0)
+        self.size = np.zeros(0, dtype=np.int32)
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.topleft = np.zeros((0, 2))
+        self.previous_topleft = np.zeros((0, 2))
+        self.base_speed = np.zeros(0)
+        self.current_speed = np.zeros(0)
+        self.is_hit = np.zeros(0, dtype=bool)
+        self.hit_cooldown = np.zeros(0)
+        # GhostType de cada slot, compartilhado com o GhostList
+        self.kinds: List[GhostType | None] = []
+        self.views: List[GhostView] = []
+
+        self._free: List[int] = []
+        # spawns que reaproveitaram o slot de um fantasma morto
+        self.recycled = 0
+        # slots vivos em ordem de desenho (do mais distante ao mais próximo)
+        self._order = np.zeros(0, dtype=np.intp)
+        # broadphase das consultas com muitos fantasmas, refeita na primeira
+        # consulta depois de qualquer mudança nos hitboxes ou na ordem
+        self.grid = SpatialGrid(bounds or pygame.Rect((0, 0), LOGICAL_SIZE))
+        self.grid_min_ghosts = GRID_MIN_GHOSTS
+        self._grid_dirty = True
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+
+        def extend(array):
+            shape = (extra,) + array.shape[1:]
+            return np.concatenate([array, np.zeros(shape, dtype=array.dtype)])
+
+        for name in (
+            "alive",
+            "type",
+            "buff",
+            "hp",
+            "distance",
+            "size",
+            "position",
+            "velocity",
+            "topleft",
+            "previous_topleft",
+            "base_speed",
+            "current_speed",
+            "is_hit",
+            "hit_cooldown",
+        ):
+            setattr(self, name, extend(getattr(self, name)))
+
+        self.kinds.extend([None] * extra)
+        self.views.extend(
+            GhostView(self, slot) for slot in range(self.capacity, capacity)
+        )
+        self._free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def spawn(
+        self,
+        position,
+        distance: float = 1.0,
+        buff: int = 0,
+        type: int = 0,
+        player_position=None,
+        rng: random.Random = random,
+        speed: Tuple[float, float] | None = None,
+    ) -> GhostView:
+        if not self._free:
+            self._grow(max(1, self.capacity * 2))
+        slot = self._free.pop()
+        # slot com tipo já foi de um fantasma que morreu
+        if self.kinds[slot] is not None:
+            self.recycled += 1
+
+        kind = self.types.get(type, buff)
+        self.alive[slot] = True
+        self.type[slot] = type
+        self.buff[slot] = buff
+        self.hp[slot] = kind.hp
+        self.kinds[slot] = kind
+        self.position[slot] = (position[0], position[1])
+        self.velocity[slot] = 0
+        self.base_speed[slot] = rng.uniform(
+            *(speed or kind.speed)
+        )  # velocidade aleatoria
+        self.current_speed[slot] = self.base_speed[slot]
+        self.is_hit[slot] = False
+        self.hit_cooldown[slot] = 0
+        self.set_distance(slot, distance)
+        self.topleft[slot] = np.trunc(self.position[slot])
+        self.previous_topleft[slot] = self.topleft[slot]
+        if player_position is not None:
+            self.player_position = player_position
+
+        self._order = np.append(self._order, slot)
+        self._grid_dirty = True
+        return self.views[slot]
+
+    def set_distance(self, slot, value) -> None:
+        self._grid_dirty = True
+        self.distance[slot] = value
+        self.size[slot] = np.trunc(self.base_size / (self.distance[slot] ** 2))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self):
+        views = self.views
+        return (views[slot] for slot in self._order)
+
+    def update_all(self, dt: float, offset, player_position, slots=None) -> None:
+        if slots is None:
+            slots = self._order
+        if player_position is not None:
+            self.player_position = player_position
+
+        hit = self.is_hit[slots]
+        cooldown = self.hit_cooldown[slots] - np.where(hit, dt, 0.0)
+        recovered = hit & (cooldown <= 0)
+        cooldown[recovered] = 0
+        hit &= ~recovered
+        self.hit_cooldown[slots] = cooldown
+        self.is_hit[slots] = hit
+
+        self.previous_topleft[slots] = self.topleft[slots]
+
+        if self.player_position is None:
+            moving = np.zeros(len(slots), dtype=bool)
+        else:
+            moving = ~hit
+
+        distance = self.distance[slots]
+        distance = np.where(moving, distance - 0.05 * dt, distance)
+        distance = np.where(moving & (distance < 1), 1.1, distance)
+        self.set_distance(slots, distance)
+
+        velocity = np.zeros((len(slots), 2))
+        if moving.any():
+            target = np.asarray(self.player_position, dtype=float)
+            direction = target - self.position[slots]
+            length = np.sqrt(direction[:, 0] ** 2 + direction[:, 1] ** 2)
+            nonzero = length > 0
+            direction[nonzero] /= length[nonzero, None]
+
+            # vai acelerando quando se aproxima da personagem
+            speed = self.base_speed[slots] * (2 - distance) * 0.5
+            self.current_speed[slots] = np.where(
+                moving, speed, self.current_speed[slots]
+            )
+            velocity = np.where(moving[:, None], direction * speed[:, None], 0.0)
+
+        self.velocity[slots] = velocity
+        self.position[slots] += velocity * dt
+
+        parallax = np.asarray((offset[0], offset[1])) * (1.0 / distance)[:, None]
+        self.topleft[slots] = np.trunc(self.position[slots] + parallax)
+        self._grid_dirty = True
+
+    def _mask(self, rect: pygame.Rect, contains: bool):
+        # slots que tocam (ou cabem inteiros no) retângulo, na ordem de desenho
+        slots = self._order
+        if len(slots) >= self.grid_min_ghosts:
+            if self._grid_dirty:
+                self.grid.build(
+                    np.take(self.topleft, slots, axis=0), self.size.take(slots)
+                )
+                self._grid_dirty = False
+            return slots[self.grid.query(rect, contains)]
+        x = self.topleft[slots, 0]
+        y = self.topleft[slots, 1]
+        size = self.size[slots]
+        return slots[overlap(x, y, size, rect, contains)]
+
+    def colliding(self, rect: pygame.Rect) -> List[GhostView]:
+        return [self.views[slot] for slot in self._mask(rect, contains=False)]
+
+    def contained_in(self, rect: pygame.Rect) -> List[GhostView]:
+        return [self.views[slot] for slot in self._mask(rect, contains=True)]
+
+    def damage(self, slots, amount: int) -> None:
+        self.hp[slots] -= amount
+        self.is_hit[slots] = True
+        self.hit_cooldown[slots] = HIT_COOLDOWN_MAX
+        self.current_speed[slots] = self.base_speed[slots] * 0.1
+
+    def damage_contained(self, rect: pygame.Rect, amount: int) -> None:
+        self.damage(self._mask(rect, contains=True), amount)
+
+    def remove_dead(self) -> List[GhostView]:
+        dead = self._order[self.hp[self._order] <= 0]
+        if not len(dead):
+            return []
+        self.alive[dead] = False
+        self._order = self._order[self.alive[self._order]]
+        self._grid_dirty = True
+        # os slots só são reaproveitados no próximo spawn, então as visões
+        # devolvidas continuam válidas até lá
+        self._free.extend(int(slot) for slot in dead[::-1])
+        return [self.views[slot] for slot in dead]
+
+    def sort_by_distance(self) -> None:
+        order = np.argsort(-self.distance[self._order], kind="stable")
+        self._order = self._order[order]
+        self._grid_dirty = True
+
+    def placements(
+        self, alpha: float = 1.0
+    ) -> List[Tuple[pygame.Surface, float, Tuple[float, float]]]:
+        # imagem base, distância e posição interpolada de cada fantasma, na
+        # ordem de desenho (ver texture_renderer.py)
+        slots = self._order
+        previous = self.previous_topleft[slots]
+        positions = previous + (self.topleft[slots] - previous) * alpha
+        kinds = self.kinds
+        return [
+            (kinds[slot].image, distance, (x, y))
+            for slot, distance, (x, y) in zip(
+                slots.tolist(), self.distance[slots].tolist(), positions.tolist()
+            )
+        ]
+
+    def draw_all(
+        self, screen: pygame.Surface, alpha: float = 1.0, slots=None
+    ) -> Dict[GhostView, pygame.Rect]:
+        if slots is None:
+            slots = self._order
+        previous = self.previous_topleft[slots]
+        positions = previous + (self.topleft[slots] - previous) * alpha
+
+        sprites = self.sprites
+        kinds = self.kinds
+        blits = [
+            (sprites.get(type, buff, distance, kinds[slot].image), (x, y))
+            for slot, type, buff, distance, (x, y) in zip(
+                slots.tolist(),
+                self.type[slots].tolist(),
+                self.buff[slots].tolist(),
+                self.distance[slots].tolist(),
+                positions.tolist(),
+            )
+        ]
+        rects = screen.blits(blits)
+        views = self.views
+        return {views[slot]: rect for slot, rect in zip(slots.tolist(), rects)}
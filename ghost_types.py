@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Dict, List, Tuple
+
+import pygame
+
+from asset_registry import ROOT, assets
+
+# tabela dos tipos de fantasma, relativa à raiz do projeto
+GHOST_TYPES_FILE = "assets/ghosts.json"
+# nomes dos buffs na tabela e nas chaves dos sprites, na ordem das
+# constantes VERMELHO, VERDE e AZUL do main.py
+BUFFS = ("red", "green", "blue")
+
+
+class GhostType:
+    # um tipo de fantasma numa cor. É compartilhado por todos os fantasmas
+    # dessa combinação: cada Ghost guarda só uma referência para ele
+    __slots__ = ("type", "buff", "name", "hp", "speed", "points", "sprite", "_image")
+
+    type: int
+    buff: int
+    name: str
+    hp: int
+    speed: Tuple[float, float]
+    points: int
+    sprite: str
+
+    def __init__(
+        self,
+        type: int,
+        buff: int,
+        name: str,
+        hp: int,
+        speed: Tuple[float, float],
+        points: int,
+        sprite: str,
+    ):
+        self.type = type
+        self.buff = buff
+        self.name = name
+        self.hp = hp
+        self.speed = speed
+        self.points = points
+        self.sprite = sprite
+        self._image: pygame.Surface | None = None
+
+    @property
+    def image(self) -> pygame.Surface:
+        # o sprite só fica guardado depois do set_mode, quando o registro já
+        # devolve a versão convertida
+        image = self._image
+        if image is None:
+            image = assets.image(self.sprite)
+            if pygame.display.get_surface() is not None:
+                self._image = image
+        return image
+
+    def __repr__(self) -> str:
+        return f"GhostType({self.name}/{BUFFS[self.buff]})"
+
+
+class GhostTypes:
+    # tabela (tipo, buff) -> GhostType, lida do ghosts.json uma única vez, no
+    # primeiro uso. Um tipo novo de fantasma é uma entrada nova no arquivo:
+    # o índice do tipo é a posição dele na lista
+    path: str
+
+    def __init__(self, path: str = GHOST_TYPES_FILE, root: str = ROOT):
+        self.path = os.path.join(root, path)
+        self._table: Dict[Tuple[int, int], GhostType] | None = None
+        self._names: List[str] = []
+
+    def load(self) -> None:
+        if self._table is not None:
+            return
+        with open(self.path) as file:
+            data = json.load(file)
+
+        table = {}
+        names = []
+        for type, entry in enumerate(data["types"]):
+            name = entry["name"]
+            missing = [buff for buff in BUFFS if buff not in entry["hp"]]
+            if missing:
+                raise ValueError(
+                    f"{self.path}: {name} sem hp para {', '.join(missing)}"
+                )
+            low, high = entry["speed"]
+            for buff, buff_name in enumerate(BUFFS):
+                table[type, buff] = GhostType(
+                    type=type,
+                    buff=buff,
+                    name=name,
+                    hp=int(entry["hp"][buff_name]),
+                    speed=(float(low), float(high)),
+                    points=int(entry.get("points", 1)),
+                    sprite=entry["sprite"].format(buff=buff_name),
+                )
+            names.append(name)
+        self._table = table
+        self._names = names
+
+    def get(self, type: int, buff: int) -> GhostType:
+        if self._table is None:
+            self.load()
+        return self._table[type, buff]
+
+    @property
+    def names(self) -> List[str]:
+        self.load()
+        return list(self._names)
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._names)
+
+
+ghost_types = GhostTypes()
@@ -0,0 +1,40 @@
+import os
+import random
+from typing import Sequence
+
+from game_input import ScriptedInput, ScriptFrame
+
+HEADLESS_DT = 1 / 60
+
+
+def setup() -> None:
+    # precisa rodar antes do pygame abrir vídeo e áudio, ou seja, antes de
+    # importar o main
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def create_game(
+    seed: int = 0,
+    script: Sequence[ScriptFrame] | None = None,
+    dt: float = HEADLESS_DT,
+    **options,
+):
+    # um Game sem janela nem som, com RNG semeado, entrada roteirizada e dt
+    # fixo: duas execuções com a mesma semente e roteiro são idênticas
+    setup()
+    from display import display
+    from main import Game
+
+    if script is None:
+        # sem roteiro, o mouse fica parado no centro da tela lógica
+        width, height = display.logical_size
+        script = (((width // 2, height // 2), False),)
+
+    return Game(
+        headless=True,
+        rng=random.Random(seed),
+        input_source=ScriptedInput(script),
+        fixed_dt=dt,
+        **options,
+    )
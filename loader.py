@@ -0,0 +1,59 @@
+import logging
+import threading
+import time
+from typing import Callable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (descrição, função que carrega)
+Task = Tuple[str, Callable[[], object]]
+
+
+class BackgroundLoader:
+    # roda uma lista de carregamentos numa thread em segundo plano, na ordem,
+    # enquanto a thread principal já desenha o menu. Um carregamento que falha
+    # é registrado e pulado: o registro tenta de novo quando o asset for usado.
+    tasks: List[Task]
+    loaded: int
+    errors: List[Tuple[str, Exception]]
+    finished_at: float | None
+
+    def __init__(self, tasks: Sequence[Task]):
+        self.tasks = list(tasks)
+        self.loaded = 0
+        self.errors = []
+        self.finished_at = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "BackgroundLoader":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="asset-loader", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        for label, task in self.tasks:
+            try:
+                task()
+            except Exception as error:
+                logger.warning("%s não carregou: %s", label, error)
+                self.errors.append((label, error))
+            self.loaded += 1
+        self.finished_at = time.perf_counter()
+
+    @property
+    def progress(self) -> float:
+        if not self.tasks:
+            return 1.0
+        return self.loaded / len(self.tasks)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
@@ -1,23 +1,56 @@
+# antes de tudo: marca o início do processo (startup.py)
+from startup import STARTED_AT
+
+import argparse
+import logging
 import pygame
 import random
-from typing import List, Tuple
+import time
+from typing import Dict, List, Sequence, Tuple
 from pygame.locals import *
-from sys import exit
+from functools import partial
+
+from asset_registry import assets
+from audio import AudioManager, audio
+from collision_masks import CollisionMasks
+from compositor import Compositor
+from dirty_rects import DirtyRectRenderer
+from display import BACKENDS, LOGICAL_SIZE, display
+from game_input import PygameInput, allow_all_events, restrict_events
+from game_loop import FixedTimestepLoop
+from ghost_engine import GhostEngine
+from ghost_types import GhostType, ghost_types
+from loader import BackgroundLoader
+from particles import ParticleSystem
+from profiler import LatencyMeter, Profiler
+from quality import QUALITY_LEVELS, QualityGovernor
+from replay import InputRecorder
+from scenes import Scene, SceneManager
+from text_cache import text_renderer
+from texture_renderer import TextureRenderer
+from spawn_director import MAX_ALIVE, WAVE_INTERVAL, SpawnDirector
+from sprite_cache import GhostSpriteCache
+
+logger = logging.getLogger(__name__)
 
 VERMELHO = 0
 VERDE = 1
 AZUL = 2
 
 
-# crio 2 variáveis globais, uma que acompanha a ultima vez que o jogador clicou, e outra que guarda o "cooldown" do clique
-last_click = 0  # variavel que acompanha o ultimo clique
-delay = 700  # delay da camera em milisegundos
+CLICK_DELAY = 700  # delay da camera em milisegundos
+# opções passadas para o Game quando o menu inicia uma partida
+GAME_OPTIONS = {}
 PLAYER_RADIUS = 50
 FRAME_ACTIVE_COLOR = pygame.Color("red")
 FRAME_DEFAULT_COLOR = pygame.Color(100, 100, 100)
 FRAME_THICKNESS = 5
 
 GHOST_BASE_SIZE = 190
+# segundos sem levar dano depois de um toque
+INVULNERABILITY = 1.0
+
+ghost_sprites = GhostSpriteCache(GHOST_BASE_SIZE)
 
 FLASH_FADE_SPEED = 500
 
@@ -34,9 +67,7 @@ class FlashEffect:
         self.alpha = 0
 
     def trigger(self) -> None:
-        # o clique so é considerado se o ultimo clique+delay for menor que o tempo atual
-        if last_click:
-            self.alpha = 255
+        self.alpha = 255
 
     def update(self, dt: float) -> None:
         if self.alpha > 0:
@@ -44,10 +75,8 @@ class FlashEffect:
             if self.alpha < 0:
                 self.alpha = 0
 
-    def draw(self, screen: pygame.Surface) -> None:
-        flash_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        flash_surface.fill((255, 255, 255, int(self.alpha)))
-        screen.blit(flash_surface, (0, 0))
+    def draw(self, screen: pygame.Surface, compositor: Compositor) -> None:
+        compositor.draw_flash(screen, self.alpha)
 
 
 class Player:
@@ -62,15 +91,25 @@ class Player:
         self,
         position: Vector2,
         color: pygame.Color,
+        rng: random.Random = random,
     ):
         self.logical_position = position.copy()
         self.position = position.copy()
+        self.previous_position = position.copy()
         self.color = color
 
+        self.rng = rng
+
         self.shake_duration = 0
         self.shake_intensity = 8
         self.shake_offset = Vector2(0, 0)
 
+        self.image_right = assets.image("player/right")
+        self.image_center = assets.image("player/center")
+        self.image_left = assets.image("player/left")
+        # o primeiro frame pode ser desenhado antes de qualquer update
+        self.current_image = self.image_center
+
     @property
     def hitbox(self) -> pygame.Rect:
         return pygame.Rect(
@@ -84,32 +123,23 @@ class Player:
         self.shake_duration = duration
         self.shake_intensity = intensity
 
-    def update(self, offset: Vector2, frame_center_x: int) -> None:
+    def update(self, offset: Vector2, frame_center_x: int, dt: float) -> None:
+        self.previous_position = self.position.copy()
         if self.shake_duration > 0:
-            self.shake_duration -= 1 / 60
-            self.shake_offset.x = random.randint(
+            self.shake_duration -= dt
+            self.shake_offset.x = self.rng.randint(
                 -self.shake_intensity, self.shake_intensity
             )
-            self.shake_offset.y = random.randint(
+            self.shake_offset.y = self.rng.randint(
                 -self.shake_intensity, self.shake_intensity
             )
             if self.shake_duration <= 0:
                 self.shake_offset = Vector2(0, 0)
 
-        self.image_right = pygame.image.load(
-            "assets/Player/Player_Turned_to_Right.png"
-        ).convert_alpha()
-        self.image_center = pygame.image.load(
-            "assets/Player/Player_Center.png"
-        ).convert_alpha()
-        self.image_left = pygame.image.load(
-            "assets/Player/Player_Turned_to_Left.png"
-        ).convert_alpha()
-
         self.current_image = self.image_center
         self.rect = self.current_image.get_rect(center=self.position)
 
-        self.screen_width = pygame.display.get_surface().get_width()
+        self.screen_width = display.logical_size[0]
         self.left_region = self.screen_width / 3
         self.right_region = 2 * self.screen_width / 3
 
@@ -123,14 +153,34 @@ class Player:
         else:
             self.current_image = self.image_center
 
-    def draw(self, screen: pygame.Surface) -> None:
-        screen.blit(self.current_image, self.rect)
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        center = self.previous_position.lerp(self.position, alpha)
+        return screen.blit(
+            self.current_image, self.current_image.get_rect(center=center)
+        )
 
 
 class Ghost:
-    type = int
-    buff: int
-    base_size: float
+    # hp inicial, faixa de velocidade, sprite e pontos ficam no GhostType
+    # compartilhado (ghost_types.py). Com __slots__ cada fantasma tem só os
+    # campos que mudam durante a partida, sem um __dict__ por instância
+    __slots__ = (
+        "kind",
+        "logical_position",
+        "hitbox",
+        "velocity",
+        "hp",
+        "base_speed",
+        "current_speed",
+        "is_hit",
+        "hit_cooldown",
+        "_distance",
+        "player_position",
+        "previous_topleft",
+    )
+    hit_cooldown_max = 1  # tempo que fica parado ao levar dano (em segundos)
+
+    kind: GhostType
     logical_position: Vector2
 
     hitbox: pygame.Rect
@@ -145,77 +195,60 @@ class Ghost:
         buff: int = 0,
         type: int = 0,
         player_position: Vector2 = None,
+        rng: random.Random = random,
+        speed: Tuple[float, float] | None = None,
     ):
         super().__init__()
-        self.hp = 10
-        self.buff = buff
+        # o retângulo e a velocidade são reaproveitados quando o GhostList
+        # recicla o fantasma (ver reset)
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.velocity = Vector2(0, 0)
+        self.reset(position, distance, buff, type, player_position, rng, speed)
+
+    def reset(
+        self,
+        position: Vector2,
+        distance: float = 1.0,
+        buff: int = 0,
+        type: int = 0,
+        player_position: Vector2 = None,
+        rng: random.Random = random,
+        speed: Tuple[float, float] | None = None,
+    ) -> None:
+        # deixa o fantasma como recém-criado, para o pool do GhostList;
+        # speed substitui a faixa de velocidade do tipo
+        self.kind = ghost_types.get(type, buff)
         self.logical_position = position
 
-        if type == 0:  # Normal
-            if buff == VERMELHO:
-                self.hp = 10
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Normal/Normal_Red.png"
-                ).convert_alpha()
-            elif buff == AZUL:
-                self.hp = 15
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Normal/Normal_Blue.png"
-                ).convert_alpha()
-            elif buff == VERDE:
-                self.hp = 20
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Normal/Normal_Green.png"
-                ).convert_alpha()
-        if type == 1:  # Goat
-            if buff == VERMELHO:
-                self.hp = 10
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Goat/Goat_Red.png"
-                ).convert_alpha()
-            elif buff == AZUL:
-                self.hp = 15
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Goat/Goat_Blue.png"
-                ).convert_alpha()
-            elif buff == VERDE:
-                self.hp = 20
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Goat/Goat_Green.png"
-                ).convert_alpha()
-        if type == 2:  # Eye
-            if buff == VERMELHO:
-                self.hp = 10
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Eye/Eye_Red.png"
-                ).convert_alpha()
-            elif buff == AZUL:
-                self.hp = 15
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Eye/Eye_Blue.png"
-                ).convert_alpha()
-            elif buff == VERDE:
-                self.hp = 20
-                self.base_image = pygame.image.load(
-                    "assets/Ghost_Eye/Eye_Green.png"
-                ).convert_alpha()
+        self.hp = self.kind.hp
 
         size = GHOST_BASE_SIZE / (distance**2)
-        self.hitbox = pygame.Rect(
-            self.logical_position,
-            Vector2(size),
-        )
+        self.hitbox.update(self.logical_position, Vector2(size))
 
-        self.velocity = Vector2(0, 0)  # inicia com velocidade zero
-        self.base_speed = random.uniform(20, 40)  # velocidade aleatoria
+        self.velocity.update(0, 0)  # inicia com velocidade zero
+        # velocidade aleatoria
+        self.base_speed = rng.uniform(*(speed or self.kind.speed))
         self.current_speed = self.base_speed
 
         self.is_hit = False
         self.hit_cooldown = 0
-        self.hit_cooldown_max = 1  # tempo que fica parado ao levar dano (em segundos)
 
         self.distance = distance
         self.player_position = player_position
+        # posição do último passo de simulação, para interpolar o desenho
+        self.previous_topleft = Vector2(self.hitbox.topleft)
+
+    @property
+    def type(self) -> int:
+        return self.kind.type
+
+    @property
+    def buff(self) -> int:
+        return self.kind.buff
+
+    @property
+    def base_image(self) -> pygame.Surface:
+        return self.kind.image
 
     @property
     def parallax_factor(self) -> float:
@@ -242,6 +275,7 @@ class Ghost:
         dt: float,
         offset: Vector2,
     ) -> None:
+        self.previous_topleft = Vector2(self.hitbox.topleft)
         if self.is_hit:
             self.hit_cooldown -= dt
             if self.hit_cooldown <= 0:
@@ -273,20 +307,91 @@ class Ghost:
         self.logical_position += self.velocity * dt
         self.hitbox.topleft = self.logical_position + offset * self.parallax_factor
 
-    def draw(self, screen: pygame.Surface) -> None:
-        base = pygame.Color([255 / self.distance**2] * 3)
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        kind = self.kind
+        image = ghost_sprites.get(kind.type, kind.buff, self._distance, kind.image)
+        topleft = self.previous_topleft.lerp(self.hitbox.topleft, alpha)
+        return screen.blit(image, topleft)
+
+
+class GhostList(list):
+    # coleção padrão de fantasmas, um objeto Ghost por fantasma. O GhostEngine
+    # (ghost_engine.py) implementa a mesma interface com arrays do NumPy.
+    pool: List[Ghost]
+    recycled: int
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        # fantasmas mortos, reaproveitados pelo spawn em vez de criar outros
+        self.pool = []
+        self.recycled = 0
+
+    def spawn(self, **kwargs) -> Ghost:
+        if self.pool:
+            ghost = self.pool.pop()
+            ghost.reset(**kwargs)
+            self.recycled += 1
+        else:
+            ghost = Ghost(**kwargs)
+        self.append(ghost)
+        return ghost
 
-        size = GHOST_BASE_SIZE / (self._distance**2)
-        scale_factor = size / max(self.base_image.get_size())
-        self.image = pygame.transform.scale(
-            self.base_image,
-            (
-                int(self.base_image.get_width() * scale_factor),
-                int(self.base_image.get_height() * scale_factor),
-            ),
+    def update_all(self, dt: float, offset: Vector2, player_position) -> None:
+        for ghost in self:
+            ghost.player_position = player_position
+            ghost.update(dt, offset)
+
+    def nearby(self, rect: pygame.Rect) -> List[Ghost]:
+        # broadphase: só os fantasmas que de fato encostam no retângulo. São
+        # três consultas por frame, e um collidelistall na lista toda sai
+        # mais barato que manter um índice espacial em dia a cada passo de
+        # cada fantasma (ver benchmarks/bench_queries.py)
+        hitboxes = [ghost.hitbox for ghost in self]
+        return [self[index] for index in rect.collidelistall(hitboxes)]
+
+    def colliding(self, rect: pygame.Rect) -> List[Ghost]:
+        return self.nearby(rect)
+
+    def contained_in(self, rect: pygame.Rect) -> List[Ghost]:
+        return [ghost for ghost in self.nearby(rect) if rect.contains(ghost.hitbox)]
+
+    def damage_contained(self, rect: pygame.Rect, amount: int) -> None:
+        for ghost in self.contained_in(rect):
+            ghost.take_damage(amount)
+
+    def remove_dead(self) -> List[Ghost]:
+        dead = [ghost for ghost in self if ghost.hp <= 0]
+        if dead:
+            self[:] = [ghost for ghost in self if ghost.hp > 0]
+            # quem chamou ainda lê os mortos (pontos, partículas) antes do
+            # próximo spawn, que é quando eles são reaproveitados
+            self.pool.extend(dead)
+        return dead
+
+    def sort_by_distance(self) -> None:
+        self.sort(
+            key=lambda ghost: ghost.distance,
+            reverse=True,
         )
-        self.rect = self.image.get_rect(center=self.logical_position)
-        screen.blit(self.image, self.hitbox.topleft)
+
+    def draw_all(
+        self, screen: pygame.Surface, alpha: float = 1.0
+    ) -> Dict[Ghost, pygame.Rect]:
+        return {ghost: ghost.draw(screen, alpha) for ghost in self}
+
+    def placements(
+        self, alpha: float = 1.0
+    ) -> List[Tuple[pygame.Surface, float, Vector2]]:
+        # imagem base, distância e posição interpolada de cada fantasma, na
+        # ordem de desenho (ver texture_renderer.py)
+        return [
+            (
+                ghost.base_image,
+                ghost.distance,
+                ghost.previous_topleft.lerp(ghost.hitbox.topleft, alpha),
+            )
+            for ghost in self
+        ]
 
 
 class Frame:
@@ -311,34 +416,14 @@ class Frame:
         center_offset = Vector2(screen.center) - Vector2(self.rect.center)
         return center_offset.multiply_componentwise(parallax_factor)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        pygame.draw.rect(overlay, (0, 0, 0, 0), self.rect)
-        screen.blit(overlay, (0, 0))
-
-        color = FRAME_ACTIVE_COLOR if self.has_target else FRAME_DEFAULT_COLOR
-        pygame.draw.rect(screen, color, self.rect, FRAME_THICKNESS)
-
-
-class Particula(pygame.sprite.Sprite):
-    def __init__(self, pos, groups):
-        super().__init__(groups)
-        self.image = pygame.Surface((4, 4))
-        self.rect = self.image.get_rect(topleft=pos)
-        self.color = "white"
-        self.image.fill(self.color)
-
-        while True:
-            self.dir_x = random.randint(-2, 2)
-            self.dir_y = random.randint(-2, 2)
+    @property
+    def outline_color(self) -> pygame.Color:
+        return FRAME_ACTIVE_COLOR if self.has_target else FRAME_DEFAULT_COLOR
 
-            if self.dir_x != 0 or self.dir_y != 0:
-                break
+    def draw(self, screen: pygame.Surface, compositor: Compositor) -> pygame.Rect:
+        compositor.draw_overlay(screen, self.rect)
 
-    def update(self):
-        self.rect.x += self.dir_x
-        self.rect.y += self.dir_y
+        return pygame.draw.rect(screen, self.outline_color, self.rect, FRAME_THICKNESS)
 
 
 class Game:
@@ -346,39 +431,127 @@ class Game:
     clock: pygame.time.Clock
     frame: Frame
     player: Player
-    ghosts: List[Ghost]
+    ghosts: GhostList | GhostEngine
+    audio: AudioManager
     flash: FlashEffect
+    compositor: Compositor
     running: bool
-    clicked: bool
-    font: pygame.font.Font
     # criei 1 variavel para cada tipo de fantasma
     points_green: int
     points_red: int
     points_blue: int
     hp: int
-    particulas: pygame.sprite.Group
-    last_ghost: int
+    particulas: ParticleSystem
+    director: SpawnDirector
+    renderer: DirtyRectRenderer | None
+    textures: TextureRenderer | None
+    headless: bool
+    game_over: bool
+    elapsed: float
+    profiler: Profiler
+    recorder: InputRecorder | None
+    profile_output: str | None
 
-    def __init__(self):
-        self.last_ghost = 0
+    def __init__(
+        self,
+        dirty_rects: bool = False,
+        headless: bool = False,
+        rng: random.Random = random,
+        input_source=None,
+        fixed_dt: float | None = None,
+        sim_rate: int = 60,
+        max_fps: int = 60,
+        vsync: bool = False,
+        ghost_engine: str = "list",
+        seed: int | None = None,
+        record: str | None = None,
+        profile: bool = False,
+        profile_output: str | None = None,
+        max_ghosts: int = MAX_ALIVE,
+        spawn_rate: float = 1.0,
+        ghost_hp: Sequence[int] | None = None,
+        ghost_speed: Tuple[float, float] | None = None,
+        click_delay: int | None = None,
+        invulnerability: float = INVULNERABILITY,
+        render: bool = True,
+        log_latency: bool = False,
+        quality: str = "auto",
+        pixel_collision: bool = False,
+    ):
         pygame.init()
         pygame.mixer.init()
 
+        # o headless (ver headless.py) roda sem som, sem tela de game over e
+        # com tempo simulado: elapsed avança só pelos dt passados ao update
+        self.headless = headless
+        # com uma semente (ou gravando) o jogo usa um RNG próprio, para que
+        # a partida possa ser refeita pelo replay.py
+        if record is not None and seed is None:
+            seed = random.randrange(2**32)
+        self.rng = rng if seed is None else random.Random(seed)
+        # RNG próprio dos efeitos: a quantidade de partículas muda com a
+        # qualidade e não pode mexer na sequência da partida
+        self.fx_rng = random.Random(self.rng.getrandbits(32))
+        self.input = input_source or PygameInput()
+        # só os carimbos da entrada ao vivo são do perf_counter deste processo;
+        # os do replay vêm do relógio de quem gravou
+        self.live_input = isinstance(self.input, PygameInput)
+        # a entrada ao vivo é lida também enquanto o loop espera o frame
+        self.poll_input = getattr(self.input, "poll", None)
+        self.recorder = None
+        self.record_path = record
+        if record is not None:
+            self.recorder = InputRecorder(
+                self.input,
+                seed,
+                fixed_dt or 1 / sim_rate,
+                # o replay.py refaz a partida com essas mesmas opções
+                options={
+                    "max_ghosts": max_ghosts,
+                    "spawn_rate": spawn_rate,
+                    "ghost_hp": ghost_hp,
+                    "ghost_speed": ghost_speed,
+                    "click_delay": click_delay,
+                    "invulnerability": invulnerability,
+                    "pixel_collision": pixel_collision,
+                },
+            )
+            self.input = self.recorder
+        self.fixed_dt = fixed_dt
+        self.elapsed = 0.0
+        self.game_over = False
+        # desligado, o profiler custa uma chamada de método por fase; F3
+        # mostra o overlay e liga as medições
+        self.profiler = Profiler(enabled=profile or profile_output is not None)
+        self.profile_output = profile_output
+        # parâmetros de balanceamento, variados pelo sweep.py
+        # None: hp e velocidade de cada tipo, como estão no ghosts.json
+        self.ghost_hp = ghost_hp  # hp por buff
+        self.ghost_speed = ghost_speed
+        self.click_delay = CLICK_DELAY if click_delay is None else click_delay
+        self.invulnerability = invulnerability
+        # sem render, o frame só simula (usado pelo sweep.py)
+        self.render_frames = render
+        # fantasmas derrotados por buff
+        self.kills = [0, 0, 0]
+        # hora (ms, ver click_time) do último clique aceito
+        self.last_click = -self.click_delay
+        # do clique ao primeiro frame apresentado com o flash (--latency)
+        self.click_latency = LatencyMeter()
+        self.log_latency = log_latency
+        self.flash_clicked_at: float | None = None
+
         self.points_green = 0
         self.points_blue = 0
         self.points_red = 0
-        self.screen = pygame.display.set_mode((800, 600))
+        # a mesma janela do menu: a partida desenha no backbuffer lógico
+        self.screen = display.open(vsync=vsync and not headless)
         self.hp = 3
-        self.invulnerabilidade_timer = 1.0
-        self.sons = {
-            # provavelmente devia estar no outro arquivo
-            "menu": pygame.mixer.Sound("sons/menu.mp3"),
-            "bgm": pygame.mixer.Sound("sons/bgm.wav"),
-            "flash": pygame.mixer.Sound("sons/flash.wav"),
-            "estatua_morre": pygame.mixer.Sound("sons/morteestatua.wav"),
-        }
-        for sound in self.sons.values():
-            sound.set_volume(0.1)
+        self.invulnerabilidade_timer = invulnerability
+        # a música toca em streaming e os efeitos já vêm carregados pela
+        # thread do AudioManager; o headless usa um mudo
+        self.audio = AudioManager(enabled=False) if headless else audio
+        self.audio.preload_effects()
 
         self.points_green = 0
         self.points_blue = 0
@@ -386,115 +559,231 @@ class Game:
         pygame.display.set_caption("Projeto IP")
 
         self.clock = pygame.time.Clock()
+        self.loop = FixedTimestepLoop(sim_rate, max_fps, clock=self.clock)
         self.flash = FlashEffect()
+        # o último frame apresentado tinha o flash (--dirty-rects)
+        self.flash_on_screen = False
         self.frame = Frame(300, 200)
-        self.player = Player(Vector2(400, 550), pygame.Color("blue"))
-        self.particulas = pygame.sprite.Group()
-
-        self.sons["bgm"].play()
-
-        self.ghosts = []
-        # diminui a quantidade de fantasmas para ficar mais vísivel
-        for _ in range(3):
-            self.ghosts.append(
-                Ghost(
-                    position=Vector2(
-                        random.uniform(0, self.screen.get_width()),
-                        (self.screen.get_height() / 2) - 80,
-                    ),
-                    distance=1.5,
-                    buff=random.randint(0, 2),
-                    type=random.randint(0, 2),
-                    player_position=self.player.position,
-                )
+        self.compositor = Compositor()
+        # modo opcional para telas com renderização por software, onde
+        # apresentar a tela inteira é o que mais pesa no frame. Com o
+        # pygame.SCALED ou o renderer a tela vai sempre inteira, então só
+        # funciona com --software-scale
+        if dirty_rects and not display.partial_present:
+            logger.warning(
+                "--dirty-rects sem efeito nesta janela, use --software-scale"
             )
+            dirty_rects = False
+        self.renderer = (
+            DirtyRectRenderer(self.screen.get_rect()) if dirty_rects else None
+        )
+        # com --renderer texture a partida é desenhada pelo Renderer do SDL
+        self.textures = (
+            TextureRenderer(display.renderer, ghost_sprites)
+            if display.renderer is not None
+            else None
+        )
+        self.player = Player(
+            Vector2(self.screen.get_width() / 2, self.screen.get_height() - 50),
+            pygame.Color("blue"),
+            self.rng,
+        )
+        self.particulas = ParticleSystem(self.screen.get_rect())
+
+        # qualidade visual: "auto" deixa o governador (quality.py) trocar de
+        # nível pelo tempo de frame; um nome fixa o nível
+        names = [level.name for level in QUALITY_LEVELS]
+        self.quality = QualityGovernor(
+            budget=1.0 / (max_fps or sim_rate),
+            level=0 if quality == "auto" else names.index(quality),
+            auto=quality == "auto" and not headless,
+        )
+        self.present_time = 0.0
+        # colisão pelos pixels opacos dos sprites, depois do teste dos
+        # retângulos (collision_masks.py)
+        self.masks = CollisionMasks(GHOST_BASE_SIZE) if pixel_collision else None
+        self._hud: List[Tuple[str, pygame.Surface, Tuple[int, int]]] | None = None
+        self._hud_age = 0
+        self.apply_quality()
+
+        self.audio.play_music("bgm")
+
+        # com o engine "numpy" os fantasmas ficam em arrays e são atualizados
+        # em lote, para hordas de milhares de fantasmas
+        if ghost_engine == "numpy":
+            self.ghosts = GhostEngine(ghost_sprites, ghost_types)
+        else:
+            self.ghosts = GhostList()
         # diminui a quantidade de fantasmas para ficar mais vísivel
-
-        self.ghosts.sort(
-            key=lambda ghost: ghost.distance,
-            reverse=True,
+        for _ in range(3):
+            self.spawn_ghost()
+        # as próximas ondas ficam por conta do diretor (spawn_director.py)
+        self.director = SpawnDirector(
+            self.ghosts,
+            self.spawn_ghost,
+            interval=tuple((t, every / spawn_rate) for t, every in WAVE_INTERVAL),
+            max_alive=max_ghosts,
         )
 
+        self.ghosts.sort_by_distance()
+
         self.running = True
-        self.clicked = False
-        self.font = pygame.font.SysFont("sans", 14)
+        if not headless:
+            restrict_events()
 
     def exibe_pontos(self, msg, tamanho, cor):
         # jéssica: mudei a fonte para ficar algo mais pixel
-        font = pygame.font.Font("menuzinho/fonts/alagard.ttf", 20)
-        mensagem = f"{msg}"
-        texto_formatado = font.render(mensagem, True, cor)
-        return texto_formatado
-
-    def add_ghost(self, last_ghost):
-        if last_ghost + 5000 < pygame.time.get_ticks():
-            self.last_ghost = pygame.time.get_ticks()
-            for _ in range(3):
-                self.ghosts.append(
-                    Ghost(
-                        position=Vector2(
-                            random.uniform(0, self.screen.get_width()),
-                            (self.screen.get_height() / 2) - 80,
-                        ),
-                        distance=1.5,
-                        type=random.randint(0, 2),
-                        buff=random.randint(0, 2),
-                    )
-                )
+        return text_renderer.render_number(msg, cor, 20)
+
+    def spawn_ghost(self):
+        ghost = self.ghosts.spawn(
+            position=Vector2(
+                self.rng.uniform(0, self.screen.get_width()),
+                (self.screen.get_height() / 2) - 80,
+            ),
+            distance=1.5,
+            buff=self.rng.randint(0, 2),
+            type=self.rng.randint(0, len(ghost_types) - 1),
+            player_position=self.player.position,
+            rng=self.rng,
+            speed=self.ghost_speed,
+        )
+        if self.ghost_hp is not None:
+            ghost.hp = self.ghost_hp[ghost.buff]
+        return ghost
 
     def exibe_hp(self, vida, tam, cor):
-        font = pygame.font.Font("menuzinho/fonts/alagard.ttf", 20)
-        vidas = f"{vida}"
-        hp_formatado = font.render(vidas, True, cor)
-        return hp_formatado
+        return text_renderer.render_number(vida, cor, 20)
+
+    def ticks(self) -> int:
+        # milissegundos de jogo, no lugar de pygame.time.get_ticks()
+        return int(self.elapsed * 1000)
 
     def is_player_in_frame(self) -> bool:
         return self.frame.rect.colliderect(self.player.hitbox)
 
+    def captured(self) -> List[Ghost]:
+        # fantasmas inteiros dentro do visor
+        rect = self.frame.rect
+        if self.masks is None:
+            return self.ghosts.contained_in(rect)
+        return [
+            ghost
+            for ghost in self.ghosts.colliding(rect)
+            if self.masks.contained(ghost, rect)
+        ]
+
+    def touching_player(self) -> List[Ghost]:
+        hitbox = self.player.hitbox
+        ghosts = self.ghosts.colliding(hitbox)
+        if self.masks is None or not ghosts:
+            return ghosts
+        mask = self.masks.player(self.player.current_image, PLAYER_RADIUS)
+        return [
+            ghost for ghost in ghosts if self.masks.touches(ghost, mask, hitbox.topleft)
+        ]
+
     def handle_events(self) -> None:
-        global last_click
-        global delay
-        for event in pygame.event.get():
+        for event in self.input.events():
             match event.type:
                 case pygame.QUIT:
                     self.running = False
+                case pygame.KEYDOWN if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                case pygame.WINDOWEXPOSED | pygame.VIDEORESIZE if (
+                    self.renderer is not None
+                ):
+                    # a janela perdeu o que estava na tela
+                    self.renderer.invalidate()
                 case pygame.MOUSEBUTTONDOWN:
                     # o evento de clicar so é considerado ser o ultimo clique + delay for menor que o tempo atual
 
+                    clicked_at = self.click_time(event)
                     if (
                         event.button == pygame.BUTTON_LEFT
-                        and last_click + delay < pygame.time.get_ticks()
+                        and self.last_click + self.click_delay < clicked_at
                     ):
-                        last_click = (
-                            pygame.time.get_ticks()
-                        )  # atualizo o tempo do ultimo clique
-                        self.clicked = True
-                        self.sons["flash"].play()
+                        # atualizo o tempo do ultimo clique
+                        self.last_click = clicked_at
+                        self.audio.play("flash")
                         self.flash.trigger()
+                        # carimbo do PygameInput; as outras fontes de entrada
+                        # contam a partir de agora
+                        self.flash_clicked_at = (
+                            event.time if self.live_input else time.perf_counter()
+                        )
+                        self.take_photo()
+
+    def click_time(self, event: pygame.event.Event) -> float:
+        # ms do clique. A entrada ao vivo carimba cada evento com a hora em
+        # que ele chegou (e o replay devolve o carimbo gravado), então o
+        # intervalo da câmera não depende de quanto o frame demorou; o
+        # roteiro do headless não tem carimbo e conta pelo tempo de jogo
+        stamp = getattr(event, "time", None)
+        return self.ticks() if stamp is None else stamp * 1000
+
+    def take_photo(self) -> None:
+        # a foto é resolvida no frame do clique, com os fantasmas onde estão
+        # na tela, mesmo num frame sem nenhum passo de simulação
+        self.frame.update(self.input.mouse_pos())
+        if self.is_player_in_frame():
+            if self.points_red > 0 and self.points_blue > 0 and self.points_green > 0:
+                self.points_red -= 1
+                self.points_blue -= 1
+                self.points_green -= 1
+
+                self.hp += 1
+                self.player.start_shake(
+                    duration=0.2, intensity=4
+                )  # Small shake for healing
+
+        # Process ghost damage
+        if self.masks is None:
+            self.ghosts.damage_contained(self.frame.rect, 5)
+        else:
+            for ghost in self.captured():
+                ghost.take_damage(5)
+
+        for ghost in self.ghosts.remove_dead():
+            # por enquanto todo fantasma vai ter o mesmo som ja q so tem um sprite
+            self.audio.play("estatua_morre")
+            self.particulas.emit(
+                ghost.hitbox.center, self.particles_per_kill, rng=self.fx_rng
+            )
+            self.kills[ghost.buff] += 1
+
+            points = ghost.kind.points
+            if ghost.buff == VERMELHO:
+                self.points_red += points
+            elif ghost.buff == VERDE:
+                self.points_green += points
+            elif ghost.buff == AZUL:
+                self.points_blue += points
 
     def update(self, dt: float) -> None:
+        self.elapsed += dt
         if self.invulnerabilidade_timer > 0:
             self.invulnerabilidade_timer -= dt
 
-        if self.invulnerabilidade_timer <= 0:
-            for ghost in self.ghosts:
-                if ghost.hitbox.colliderect(self.player.hitbox) and self.hp > 0:
-                    self.hp -= 1
-                    self.invulnerabilidade_timer = 1.0
-                    self.player.start_shake()
-                    if self.hp <= 0:
-                        self.points_blue = 0
-                        self.points_green = 0
-                        self.points_red = 0
-                        gameover(self.screen)
-                        self.running = False
-                        return
-
-        mouse_pos = pygame.mouse.get_pos()
+        with self.profiler.phase("update.collision"):
+            if self.invulnerabilidade_timer <= 0:
+                for ghost in self.touching_player():
+                    if self.hp > 0:
+                        self.hp -= 1
+                        self.invulnerabilidade_timer = self.invulnerability
+                        self.player.start_shake()
+                        if self.hp <= 0:
+                            self.points_blue = 0
+                            self.points_green = 0
+                            self.points_red = 0
+                            self.game_over = True
+                            self.running = False
+                            return
+
+        mouse_pos = self.input.mouse_pos()
         self.frame.update(mouse_pos)
 
-        for ghost in self.ghosts:
-            ghost.player_position = self.player.position
+        player_position = self.player.position
 
         PLAYER_PARALLAX_FACTOR = Vector2(0.4, 0.2)
         offset = self.frame.calculate_parallax_offset(
@@ -502,155 +791,286 @@ class Game:
             PLAYER_PARALLAX_FACTOR,
         )
 
-        self.player.update(offset, self.frame.rect.centerx)
+        self.player.update(offset, self.frame.rect.centerx, dt)
 
-        frame_has_target = any(
-            self.frame.rect.contains(ghost.hitbox) for ghost in self.ghosts
-        )
-        self.frame.has_target = frame_has_target
-
-        if self.clicked:
-            if self.is_player_in_frame():
-                if (
-                    self.points_red > 0
-                    and self.points_blue > 0
-                    and self.points_green > 0
-                ):
-                    self.points_red -= 1
-                    self.points_blue -= 1
-                    self.points_green -= 1
-
-                    self.hp += 1
-                    self.player.start_shake(
-                        duration=0.2, intensity=4
-                    )  # Small shake for healing
-
-            # Process ghost damage
-            new_ghosts = []
-
-            for ghost in self.ghosts:
-                if self.frame.rect.contains(ghost.hitbox):
-                    ghost.take_damage(5)
-                if ghost.hp > 0:
-                    new_ghosts.append(ghost)
-                else:
-                    self.sons[
-                        "estatua_morre"
-                    ].play()  # por enquanto todo fantasma vai ter o mesmo som ja q so tem um sprite
-                    for _ in range(5):
-                        Particula(ghost.hitbox.center, self.particulas)
-
-                    if ghost.buff == VERMELHO:
-                        self.points_red += 1
-                    elif ghost.buff == VERDE:
-                        self.points_green += 1
-                    elif ghost.buff == AZUL:
-                        self.points_blue += 1
-
-            self.ghosts = new_ghosts
-
-            self.clicked = False
-
-        self.particulas.update()
-
-        for ghost in self.ghosts:
-            ghost.update(dt, offset)
+        with self.profiler.phase("update.collision"):
+            frame_has_target = bool(self.captured())
+            self.frame.has_target = frame_has_target
 
-        self.ghosts.sort(
-            key=lambda ghost: ghost.distance,
-            reverse=True,
-        )
+        with self.profiler.phase("update.particles"):
+            self.particulas.update(dt)
+
+        with self.profiler.phase("update.ghosts"):
+            self.ghosts.update_all(dt, offset, player_position)
+        with self.profiler.phase("update.sort"):
+            self.ghosts.sort_by_distance()
 
         self.flash.update(dt)
 
-    def draw(self) -> None:
+    def draw(self, alpha: float = 1.0) -> None:
+        if self.textures is not None:
+            with self.profiler.phase("draw"):
+                self.textures.draw(self, alpha)
+            start = time.perf_counter()
+            with self.profiler.phase("present"):
+                self.textures.present()
+            self.present_time = time.perf_counter() - start
+            self.presented()
+            return
+
+        with self.profiler.phase("draw"):
+            dirty = self.render(alpha)
+
+        overlay = self.profiler.draw_overlay(self.screen)
+        if overlay is not None:
+            dirty["profiler"] = overlay
+
+        start = time.perf_counter()
+        with self.profiler.phase("present"):
+            if self.renderer is None:
+                display.present()
+            else:
+                # o flash muda a tela inteira, e o frame em que ele acaba
+                # também: senão o resto dele fica na tela fora das regiões
+                # sujas
+                flash = self.flash.alpha > 0
+                if self.flash_on_screen and not flash:
+                    self.renderer.invalidate()
+                self.flash_on_screen = flash
+                self.renderer.present(dirty, full=flash)
+        self.present_time = time.perf_counter() - start
+        self.presented()
+
+    def presented(self) -> None:
+        # o primeiro frame apresentado depois de um clique já tem o flash
+        if self.flash_clicked_at is None:
+            return
+        latency = self.click_latency.add(time.perf_counter() - self.flash_clicked_at)
+        self.flash_clicked_at = None
+        if self.log_latency:
+            logger.info("clique -> flash: %.1f ms", latency)
+
+    def render(self, alpha: float) -> Dict:
+        # alpha: fração do passo de simulação já decorrida, para interpolar.
+        # Devolve o retângulo desenhado de cada coisa, para o DirtyRectRenderer
         self.screen.fill((0, 0, 0))
-        self.particulas.draw(self.screen)
-
-        for rect in self.ghosts:
-            rect.draw(self.screen)
-
-        self.player.draw(self.screen)
-        self.frame.draw(self.screen)
-        self.flash.draw(self.screen)
-
+        dirty = self.particulas.draw(self.screen)
+
+        with self.profiler.phase("draw.ghosts"):
+            dirty.update(self.ghosts.draw_all(self.screen, alpha))
+
+        dirty["player"] = self.player.draw(self.screen, alpha)
+        with self.profiler.phase("draw.overlay"):
+            dirty["frame"] = self.frame.draw(self.screen, self.compositor)
+        with self.profiler.phase("draw.flash"):
+            self.flash.draw(self.screen, self.compositor)
+
+        with self.profiler.phase("draw.hud"):
+            for key, texto, posicao in self.hud():
+                dirty[key] = self.screen.blit(texto, posicao)
+
+        return dirty
+
+    def snapshot(self) -> pygame.Surface:
+        # cópia do último frame desenhado (com alpha 1, como no headless),
+        # para comparar os backends (render_compare.py)
+        if self.textures is not None:
+            return self.textures.snapshot(self)
+        return self.screen.copy()
+
+    def hud(self) -> List[Tuple[str, pygame.Surface, Tuple[int, int]]]:
+        # nas qualidades mais baixas o HUD é refeito só a cada hud_every frames
+        self._hud_age += 1
+        if self._hud is None or self._hud_age >= self.hud_every:
+            self._hud = self.build_hud()
+            self._hud_age = 0
+        return self._hud
+
+    def build_hud(self) -> List[Tuple[str, pygame.Surface, Tuple[int, int]]]:
         # uma variavel para o os pontos de cada um
-
+        largura = self.screen.get_width()
         texto_pontos_green = self.exibe_pontos(self.points_green, 40, (0, 255, 0))
         texto_pontos_blue = self.exibe_pontos(self.points_blue, 40, (0, 0, 255))
         texto_pontos_red = self.exibe_pontos(self.points_red, 40, (255, 0, 0))
-        self.screen.blit(texto_pontos_green, (self.screen.get_width() - 100, 10))
-        self.screen.blit(texto_pontos_blue, (self.screen.get_width() - 65, 10))
-        self.screen.blit(texto_pontos_red, (self.screen.get_width() - 30, 10))
-
         texto_hp = self.exibe_hp(self.hp, 40, (255, 0, 0))
-        self.screen.blit(texto_hp, (30, 30))
-
-        pygame.display.flip()
+        return [
+            ("pontos_green", texto_pontos_green, (largura - 100, 10)),
+            ("pontos_blue", texto_pontos_blue, (largura - 65, 10)),
+            ("pontos_red", texto_pontos_red, (largura - 30, 10)),
+            ("hp", texto_hp, (30, 30)),
+        ]
+
+    def step(self, dt: float) -> None:
+        self.advance_frame(1, dt)
+
+    def advance_frame(self, steps: int, dt: float, alpha: float = 1.0) -> None:
+        # um frame: lê a entrada, roda steps passos de simulação e desenha.
+        # O loop ao vivo, o headless e o replay passam todos por aqui
+        self.profiler.begin_frame()
+        self.audio.update()
+        with self.profiler.phase("events"):
+            self.handle_events()
+        if self.recorder is not None:
+            self.recorder.commit(steps)
+        for _ in range(steps):
+            with self.profiler.phase("update"):
+                self.update(dt)
+            if not self.running:
+                break
+            self.director.update(self.elapsed)
+        if self.running and self.render_frames:
+            self.draw(alpha)
+        self.profiler.end_frame()
 
     def run(self) -> None:
         while self.running:
-            dt = self.clock.tick() / 1000.0
-
-            self.handle_events()
-            self.update(dt)
-            self.draw()
-            self.add_ghost(self.last_ghost)
+            if self.fixed_dt is not None:
+                # headless: um passo por iteração, sem esperar o relógio
+                self.step(self.fixed_dt)
+                continue
+
+            self.live_frame()
+
+        self.finish()
+
+    def live_frame(self) -> None:
+        # um frame do loop ao vivo: espera o relógio e roda os passos devidos
+        frame_time = self.loop.tick(self.poll_input)
+        steps = self.loop.advance(frame_time)
+        start = time.perf_counter()
+        self.advance_frame(steps, self.loop.dt, self.loop.alpha)
+        work_time = time.perf_counter() - start
+        if display.vsync:
+            # com vsync o present espera a tela, não é trabalho
+            work_time -= self.present_time
+        if self.quality.sample(frame_time, work_time, self.elapsed):
+            self.apply_quality()
+
+    def apply_quality(self) -> None:
+        level = self.quality.current
+        self.particles_per_kill = level.particles
+        ghost_sprites.set_band_step(level.band_step)
+        self.compositor.fast_flash = level.fast_flash
+        self.hud_every = level.hud_every
+        self._hud = None
+
+    def finish(self) -> None:
+        # fim da partida: grava o replay e o profile, se pedidos
+        if not self.headless:
+            allow_all_events()
+        if self.log_latency and self.click_latency.count:
+            stats = self.click_latency.stats()
+            logger.info(
+                "clique -> flash em %d cliques: p50 %.1f ms, p95 %.1f ms, máx %.1f ms",
+                stats["count"],
+                stats["p50"],
+                stats["p95"],
+                stats["max"],
+            )
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+        if self.profile_output is not None:
+            self.profiler.export(self.profile_output)
 
-        pygame.quit()
 
+# adicionando o menu
 
-#tela de créditos
-def créditos(screen, tamanho, font):
-    while True:
-        screen.fill("black")
-        printimage(
-            "menuzinho/imagens/fundomenu.png", tamanho, screen, (0, 0)
-        )
-        printimage(
-            "menuzinho/imagens/detalhecantos.png",
-            tamanho,
-            screen,
-            (0, 0),
-        )
-        printartext("Equipe 4", font, "grey", screen, (50,200))
-        printartext("Heiji Hirakawa <hh>", font, "grey", screen, (50,240))
-        printartext("Jessica Macedo <jalm2>", font, "grey", screen, (50,260))
-        printartext("Levy Dorgival <ldsa>", font, "grey", screen, (50,280))
-        printartext("Samira Cikarele <scsms>", font, "grey", screen, (50,300))
-        printartext("Heitor Nascimento <hnd>", font, "grey", screen, (50,320))
-        printartext("Vitor Nascimento <vnb>", font, "grey", screen, (50,340))
-        printartext("> pressione C para voltar ao menu <", font, "grey", screen, (150,500))
+# só isso precisa estar carregado para o primeiro frame do menu; o resto vem
+# do carregamento em segundo plano
+MENU_IMAGES = ("menu/fundo", "menu/cantos", "menu/titulo", "menu/jogar", "menu/sair")
+
+carregamento: BackgroundLoader | None = None
+# segundos desde o import do main até cada marco da inicialização
+tempos_inicio: Dict[str, float] = {}
+
+
+def inicia_carregamento() -> BackgroundLoader:
+    global carregamento
+    if carregamento is None:
+        tarefas = [
+            (f"imagem {key}", partial(assets.decode, key))
+            for key in assets.images
+            if key not in MENU_IMAGES
+        ]
+        tarefas += [
+            (f"som {key}", partial(audio.load_effect, key)) for key in audio.effects
+        ]
+        carregamento = BackgroundLoader(tarefas).start()
+    return carregamento
+
+
+def marca_inicio(marco: str) -> None:
+    if marco in tempos_inicio:
+        return
+    tempos_inicio[marco] = time.perf_counter() - STARTED_AT
+    logger.info("%s: %.0f ms", marco, tempos_inicio[marco] * 1000)
+
+
+def desenha_progresso(screen, loader, font):
+    # barra no rodapé enquanto o carregamento em segundo plano não termina
+    largura = screen.get_width() - 100
+    barra = pygame.Rect(50, screen.get_height() - 20, largura, 6)
+    pygame.draw.rect(screen, (60, 60, 60), barra)
+    barra.width = int(largura * loader.progress)
+    pygame.draw.rect(screen, "grey", barra)
+    printartext("carregando...", font, "grey", screen, (50, screen.get_height() - 45))
+
+
+def espera_carregamento(screen, loader, font) -> bool:
+    # o jogo só começa com tudo carregado; mostra o progresso até lá.
+    # Devolve False se a janela foi fechada no meio
+    while not loader.wait(1 / 30):
         for evento in pygame.event.get():
             if evento.type == QUIT:
-                pygame.quit()
-                exit()
-            if evento.type == pygame.KEYDOWN:
-                if evento.key == pygame.K_c:
-                    return
-                
-        pygame.display.update()
-# adicionando o menu
+                return False
+        screen.fill("black", (0, screen.get_height() - 50, screen.get_width(), 50))
+        desenha_progresso(screen, loader, font)
+        display.present()
+    return True
 
-# criando display do menu
-pygame.init()
-pygame.mixer.init()
-pygame.display.set_caption("menu")
-fonte = pygame.font.Font("menuzinho/fonts/alagard.ttf", 20)
 
-buttonplay = pygame.image.load("menuzinho/imagens/jogarbotao.png")
-buttonexit = pygame.image.load("menuzinho/imagens/sairbotao.png")
+# parado, o menu acorda só para eventos e, no máximo, a cada tanto tempo
+# (para a troca de música e a barra de carregamento)
+IDLE_TIMEOUT_MS = 100
+
+# fundos já compostos das telas do menu, por nome e tamanho
+camadas_estaticas: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+
+
+def camada_estatica(nome, tamanho, desenha):
+    # compõe uma vez tudo o que não muda numa tela e guarda a surface pronta
+    chave = (nome, tamanho)
+    camada = camadas_estaticas.get(chave)
+    if camada is None:
+        # no formato do backbuffer, também no backend de texturas, onde não
+        # há surface do pygame.display para o convert
+        camada = pygame.Surface(tamanho, 0, display.surface)
+        camada.fill("black")
+        desenha(camada)
+        camadas_estaticas[chave] = camada
+    return camada
+
+
+def espera_eventos(timeout=IDLE_TIMEOUT_MS):
+    # bloqueia até chegar um evento (ou o timeout), em vez de girar o loop
+    evento = pygame.event.wait(timeout)
+    if evento.type == pygame.NOEVENT:
+        return []
+    return [display.map_event(evento)] + display.events()
 
 
 # função para deixar o print de imagens e textos mais organizado
-def printimage(folder, scale, screen, position):
-    image = pygame.image.load(folder)
-    image = pygame.transform.scale(image, scale)
+def printimage(key, scale, screen, position):
+    # a imagem escalada fica em cache no registro, só é redimensionada uma vez
+    image = assets.scaled(key, scale)
     screen.blit(image, position)
+
+
 def printartext(texto, fonfon, cor, tela, posição):
     textprint = fonfon.render(texto, True, cor)
     tela.blit(textprint, posição)
 
+
 # criando a estrutura do botão
 class button:
     def __init__(self, x, y, image, scale, screen):
@@ -664,97 +1084,346 @@ class button:
         self.clicou = False
         self.screeen = screen
 
-    def draw(self):  # colocar botão na tela
-        action = False
-        mouse = pygame.mouse.get_pos()  # tracking do mouse. se passar por cima da área do botão e clicar, irá entrar no if
-
-        if self.rect.collidepoint(mouse):
-            # o 0 é button esquerdo do mouse
-            if pygame.mouse.get_pressed()[0] == 1 and self.clicou is False:
-                self.clicou = True
-                action = True
-        if pygame.mouse.get_pressed()[0] == 0:
-            self.clicou = False
-        self.screeen.blit(self.image, (self.rect.x, self.rect.y))
-        return action
-
-fonte = pygame.font.Font("menuzinho/fonts/alagard.ttf", 15)
-fontemaior = pygame.font.Font("menuzinho/fonts/alagard.ttf", 20)
-
-def menu_principal():
-    tamanhoscreen = (960, 540)
-    screenprincipal = pygame.display.set_mode(
-        tamanhoscreen
-    )  # o menu está em outra proporção
-    musica = pygame.mixer.Sound("sons/menu.mp3").play()
-    musica.set_volume(0.2)
-    botaplay = button(160, 210, buttonplay, 0.65, screenprincipal)
-    botaexit = button(160, 310, buttonexit, 0.65, screenprincipal)
-    while True:
-        screenprincipal.fill("black")
+    def clicked(self, eventos):
+        # o clique vem dos eventos, então não se perde entre um frame e outro
+        # mesmo com o loop dormindo no event.wait
+        for evento in eventos:
+            if (
+                evento.type == pygame.MOUSEBUTTONDOWN
+                and evento.button == pygame.BUTTON_LEFT
+                # posições já em coordenadas lógicas (ver display.py)
+                and self.rect.collidepoint(evento.pos)
+            ):
+                return True
+        return False
+
+    def hovered(self):
+        return self.rect.collidepoint(display.mouse_pos())
+
+    def draw(self, screen=None):  # colocar botão na tela
+        (screen or self.screeen).blit(self.image, (self.rect.x, self.rect.y))
+
+
+# tela de créditos
+class CreditsScene(Scene):
+    def __init__(self, tamanho, font):
+        self.tamanho = tamanho
+        self.font = font
+
+    def desenha(self, camada):
+        font = self.font
+        printimage("menu/fundo", self.tamanho, camada, (0, 0))
         printimage(
-            "menuzinho/imagens/fundomenu.png", tamanhoscreen, screenprincipal, (0, 0)
+            "menu/cantos",
+            self.tamanho,
+            camada,
+            (0, 0),
+        )
+        printartext("Equipe 4", font, "grey", camada, (50, 200))
+        printartext("Heiji Hirakawa <hh>", font, "grey", camada, (50, 240))
+        printartext("Jessica Macedo <jalm2>", font, "grey", camada, (50, 260))
+        printartext("Levy Dorgival <ldsa>", font, "grey", camada, (50, 280))
+        printartext("Samira Cikarele <scsms>", font, "grey", camada, (50, 300))
+        printartext("Heitor Nascimento <hnd>", font, "grey", camada, (50, 320))
+        printartext("Vitor Nascimento <vnb>", font, "grey", camada, (50, 340))
+        printartext(
+            "> pressione C para voltar ao menu <", font, "grey", camada, (150, 500)
+        )
+
+    def enter(self):
+        # a tela é toda estática: desenha uma vez e só espera o C
+        self.screen = display.open()
+        self.screen.blit(
+            camada_estatica("créditos", self.tamanho, self.desenha), (0, 0)
         )
+        display.present()
+
+    def step(self):
+        for evento in espera_eventos():
+            if evento.type == QUIT:
+                self.manager.quit()
+            if evento.type == pygame.KEYDOWN:
+                if evento.key == pygame.K_c:
+                    self.manager.pop()
+            if evento.type == pygame.WINDOWEXPOSED:
+                display.present()
+
+        audio.update()
+
+
+class MenuScene(Scene):
+    tamanho = display.logical_size
+
+    def enter(self):
+        self.screen = display.open()
+        self.fonte = assets.font("alagard", 15)
+        self.fontemaior = assets.font("alagard", 20)
+        buttonplay = assets.image("menu/jogar")
+        buttonexit = assets.image("menu/sair")
+        # o resto (sprites do jogo, efeitos e game over) carrega numa thread
+        # enquanto o menu já aparece
+        self.loader = inicia_carregamento()
+        self.botaplay = button(160, 210, buttonplay, 0.65, self.screen)
+        self.botaexit = button(160, 310, buttonexit, 0.65, self.screen)
+        self.fundo = camada_estatica("menu", self.tamanho, self.desenha)
+        self.resume()
+
+    def resume(self):
+        # de volta dos créditos ou de uma partida
+        self.screen = display.open()
+        audio.play_music("menu")
+        self.redesenhar = True
+        self.ultimo_estado = None
+        # apresenta já: o primeiro espera_eventos pode ficar até
+        # IDLE_TIMEOUT_MS parado antes de o menu aparecer
+        self.apresenta()
+
+    def desenha(self, camada):
+        printimage("menu/fundo", self.tamanho, camada, (0, 0))
         printimage(
-            "menuzinho/imagens/detalhecantos.png",
-            tamanhoscreen,
-            screenprincipal,
+            "menu/cantos",
+            self.tamanho,
+            camada,
             (0, 0),
         )
         printimage(
-            "menuzinho/imagens/título provisório.png",
+            "menu/titulo",
             (512, 161),
-            screenprincipal,
+            camada,
             (10, 35),
         )
-        printartext("> pressione C para creditos <", fonte, "grey", screenprincipal, (150,500))
-        if botaplay.draw():
-            pygame.mixer.stop()
-            game = Game()
-            game.run()
-        if botaexit.draw():
-            pygame.quit()
-            exit()
+        printartext(
+            "> pressione C para creditos <", self.fonte, "grey", camada, (150, 500)
+        )
+        self.botaplay.draw(camada)
+        self.botaexit.draw(camada)
 
-        for evento in pygame.event.get():
+    def step(self):
+        eventos = espera_eventos()
+        for evento in eventos:
             if evento.type == QUIT:
-                pygame.quit()
-                exit()
+                self.manager.quit()
+                return
             if evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_c:
-                    créditos(screenprincipal, tamanhoscreen, fontemaior)
-                
-        pygame.display.update()
+                    self.manager.push(CreditsScene(self.tamanho, self.fontemaior))
+                    return
+            if evento.type == pygame.WINDOWEXPOSED:
+                self.redesenhar = True
+
+        if self.botaplay.clicked(eventos):
+            if espera_carregamento(self.screen, self.loader, self.fonte):
+                self.manager.push(GameScene(GAME_OPTIONS))
+            else:
+                self.manager.quit()
+            return
+        if self.botaexit.clicked(eventos):
+            self.manager.quit()
+            return
+
+        audio.update()
+        self.apresenta()
+
+    def apresenta(self):
+        # só a barra de carregamento e o hover mudam; sem mudança, nada é
+        # redesenhado nem enviado para a tela
+        loader = self.loader
+        estado = (
+            self.botaplay.hovered(),
+            self.botaexit.hovered(),
+            None if loader.done else round(loader.progress, 2),
+        )
+        if self.redesenhar or estado != self.ultimo_estado:
+            self.screen.blit(self.fundo, (0, 0))
+            if not loader.done:
+                desenha_progresso(self.screen, loader, self.fonte)
+            display.present()
+            self.redesenhar = False
+            self.ultimo_estado = estado
+
+        marca_inicio("primeiro frame")
+        if loader.done:
+            marca_inicio("interativo")
 
 
 # aqui termina o menu
 
 
+class GameScene(Scene):
+    # uma partida. O Game só existe enquanto a cena está na pilha: ao sair,
+    # fantasmas, partículas e o resto da partida são soltos
+    game: Game | None
+
+    def __init__(self, options: Dict):
+        self.options = options
+        self.game = None
+
+    def enter(self):
+        self.game = Game(**self.options)
+
+    def exit(self):
+        self.game.finish()
+        self.game = None
+
+    def step(self):
+        game = self.game
+        game.live_frame()
+        if game.running:
+            return
+        if game.game_over:
+            self.manager.replace(GameOverScene())
+        else:
+            # janela fechada no meio da partida
+            self.manager.quit()
+
+
 # início do game over
-buttonmenu = pygame.image.load("menuzinho/imagens/botãomenu.png")
-gameover_image = pygame.image.load("menuzinho/imagens/gameover.png")
-
-
-def gameover(screen):
-    runnning = True
-    pygame.mixer.stop()
-    musica2 = pygame.mixer.Sound("sons/OMORI OST - 001 Title.wav").play()
-    musica2.set_volume(0.2)
-    while runnning:
-        screen.fill("black")
-        printimage("menuzinho/imagens/gameover.png", (512, 384), screen, (120, 40))
-        botamenu = button(290, 350, buttonmenu, 0.65, screen)
-        if botamenu.draw():
-            pygame.mixer.stop()  # parar música
-            menu_principal()  # iniciar menu principal
-        for evento in pygame.event.get():
+
+
+class GameOverScene(Scene):
+    def enter(self):
+        self.screen = display.open()
+        buttonmenu = assets.image("menu/botao_menu")
+        audio.play_music("gameover")
+        self.botamenu = button(370, 350, buttonmenu, 0.65, self.screen)
+        self.screen.blit(
+            camada_estatica("gameover", self.screen.get_size(), self.desenha), (0, 0)
+        )
+        display.present()
+
+    def desenha(self, camada):
+        printimage("menu/gameover", (512, 384), camada, (200, 40))
+        self.botamenu.draw(camada)
+
+    def step(self):
+        eventos = espera_eventos()
+        if self.botamenu.clicked(eventos):
+            self.manager.pop()  # voltar ao menu principal
+            return
+        for evento in eventos:
             if evento.type == QUIT:
-                pygame.quit()
-                exit()
-        pygame.display.update()
+                self.manager.quit()
+                return
+            if evento.type == pygame.WINDOWEXPOSED:
+                display.present()
+        audio.update()
 
 
 # fim do game over
 
 if __name__ == "__main__":
-    menu_principal()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="atualiza só as regiões da tela que mudaram (com --software-scale)",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        type=int,
+        default=60,
+        help="passos de simulação por segundo",
+    )
+    parser.add_argument(
+        "--max-fps",
+        type=int,
+        default=60,
+        help="limite de frames desenhados por segundo (0 = sem limite)",
+    )
+    parser.add_argument("--vsync", action="store_true", help="sincroniza com a tela")
+    parser.add_argument(
+        "--fullscreen",
+        action="store_true",
+        help=f"tela cheia, com o jogo ({LOGICAL_SIZE[0]}x{LOGICAL_SIZE[1]}) escalado",
+    )
+    parser.add_argument(
+        "--window",
+        metavar="LxA",
+        type=lambda texto: tuple(int(n) for n in texto.lower().split("x")),
+        help="tamanho inicial da janela, por exemplo 1920x1080",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=BACKENDS,
+        default="surface",
+        help="texture desenha a partida com o Renderer do SDL (GPU se houver)",
+    )
+    parser.add_argument(
+        "--software-scale",
+        action="store_true",
+        help="escala com transform.scale em vez do pygame.SCALED",
+    )
+    parser.add_argument(
+        "--ghost-engine",
+        choices=("list", "numpy"),
+        default="list",
+        help="numpy guarda os fantasmas em arrays (requer uv sync --extra fast)",
+    )
+    parser.add_argument(
+        "--max-ghosts",
+        type=int,
+        default=MAX_ALIVE,
+        help="limite de fantasmas vivos ao mesmo tempo",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="semente do RNG, para repetir uma partida"
+    )
+    parser.add_argument(
+        "--record",
+        metavar="ARQUIVO",
+        help="grava a entrada e a semente da partida para o replay.py",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="mede o tempo de cada fase do frame (F3 mostra os percentis)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PREFIXO",
+        help="ao sair, grava PREFIXO.json (trace do Chrome) e PREFIXO.csv",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=["auto"] + [level.name for level in QUALITY_LEVELS],
+        default="auto",
+        help="nível de qualidade visual; auto troca de nível pelo tempo de frame",
+    )
+    parser.add_argument(
+        "--pixel-collision",
+        action="store_true",
+        help="captura e contato pelos pixels opacos dos sprites, não pelas caixas",
+    )
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="mostra no terminal o tempo de cada clique até o flash aparecer",
+    )
+    args = parser.parse_args()
+    GAME_OPTIONS["dirty_rects"] = args.dirty_rects
+    GAME_OPTIONS["sim_rate"] = args.sim_rate
+    GAME_OPTIONS["max_fps"] = args.max_fps
+    GAME_OPTIONS["vsync"] = args.vsync
+    GAME_OPTIONS["ghost_engine"] = args.ghost_engine
+    GAME_OPTIONS["max_ghosts"] = args.max_ghosts
+    GAME_OPTIONS["seed"] = args.seed
+    GAME_OPTIONS["record"] = args.record
+    GAME_OPTIONS["profile"] = args.profile
+    GAME_OPTIONS["profile_output"] = args.profile_output
+    GAME_OPTIONS["log_latency"] = args.latency
+    GAME_OPTIONS["quality"] = args.quality
+    GAME_OPTIONS["pixel_collision"] = args.pixel_collision
+    # as trocas de qualidade e os avisos dos módulos aparecem no terminal
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    display.vsync = args.vsync
+    display.fullscreen = args.fullscreen
+    display.window_size = args.window
+    display.software = args.software_scale
+    display.backend = args.renderer
+
+    pygame.init()
+    pygame.mixer.init()
+    pygame.display.set_caption("menu")
+    SceneManager().run(MenuScene())
+    pygame.quit()
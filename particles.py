@@ -0,0 +1,149 @@
+import random
+from array import array
+from typing import Dict, Hashable, List, Tuple
+
+import pygame
+
+DEFAULT_CAPACITY = 512
+PARTICLE_SIZE = 4
+# tempo de vida de cada partícula (em segundos)
+PARTICLE_LIFETIME = 0.75
+# as partículas andavam de 1 a 2 pixels por frame a 60 fps
+PARTICLE_SPEED = 60
+
+
+class ParticleSystem:
+    # partículas num pool de tamanho fixo: posição, velocidade, tempo de vida e
+    # cor ficam em arrays indexados pelo slot, e cada slot volta para a lista
+    # de livres quando a partícula expira ou sai da tela. Todas as partículas
+    # de uma cor usam a mesma surface e são desenhadas num único blits.
+    bounds: pygame.Rect
+    capacity: int
+    lifetime: float
+    emitted: int
+    expired: int
+    culled: int
+    dropped: int
+
+    def __init__(
+        self,
+        bounds: pygame.Rect,
+        capacity: int = DEFAULT_CAPACITY,
+        lifetime: float = PARTICLE_LIFETIME,
+    ):
+        self.bounds = bounds.copy()
+        self.capacity = capacity
+        self.lifetime = lifetime
+
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.life = array("d", bytes(8 * capacity))
+        self.color = array("B", bytes(capacity))
+
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._active: List[int] = []
+        # uma surface por cor, compartilhada por todas as partículas dela
+        self._palette: List[pygame.Surface] = []
+        self._colors: Dict[Tuple[int, int, int], int] = {}
+
+        self.emitted = 0
+        self.expired = 0
+        self.culled = 0
+        self.dropped = 0
+
+    def _color_index(self, color) -> int:
+        key = tuple(pygame.Color(color))[:3]
+        index = self._colors.get(key)
+        if index is None:
+            surface = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE))
+            surface.fill(key)
+            index = len(self._palette)
+            self._palette.append(surface)
+            self._colors[key] = index
+        return index
+
+    def emit(
+        self,
+        position,
+        count: int = 1,
+        color="white",
+        rng: random.Random = random,
+    ) -> None:
+        color_index = self._color_index(color)
+        for _ in range(count):
+            while True:
+                dir_x = rng.randint(-2, 2)
+                dir_y = rng.randint(-2, 2)
+
+                if dir_x != 0 or dir_y != 0:
+                    break
+
+            if not self._free:
+                # pool cheio: a partícula nova é descartada
+                self.dropped += 1
+                continue
+
+            slot = self._free.pop()
+            self.x[slot] = position[0]
+            self.y[slot] = position[1]
+            self.vx[slot] = dir_x * PARTICLE_SPEED
+            self.vy[slot] = dir_y * PARTICLE_SPEED
+            self.life[slot] = self.lifetime
+            self.color[slot] = color_index
+            self._active.append(slot)
+            self.emitted += 1
+
+    def update(self, dt: float) -> None:
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        left, top = self.bounds.left - PARTICLE_SIZE, self.bounds.top - PARTICLE_SIZE
+        right, bottom = self.bounds.right, self.bounds.bottom
+
+        alive = []
+        for slot in self._active:
+            life[slot] -= dt
+            if life[slot] <= 0:
+                self.expired += 1
+                self._free.append(slot)
+                continue
+
+            x[slot] += vx[slot] * dt
+            y[slot] += vy[slot] * dt
+            if not (left < x[slot] < right and top < y[slot] < bottom):
+                self.culled += 1
+                self._free.append(slot)
+                continue
+
+            alive.append(slot)
+        self._active = alive
+
+    def placements(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        x, y, color, palette = self.x, self.y, self.color, self._palette
+        return [
+            (palette[color[slot]], (int(x[slot]), int(y[slot])))
+            for slot in self._active
+        ]
+
+    def draw(self, screen: pygame.Surface) -> Dict[Hashable, pygame.Rect]:
+        if not self._active:
+            return {}
+        rects = screen.blits(self.placements())
+        return {("particula", slot): rect for slot, rect in zip(self._active, rects)}
+
+    def clear(self) -> None:
+        self._free.extend(reversed(self._active))
+        self._active = []
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self),
+            "capacity": self.capacity,
+            "emitted": self.emitted,
+            "expired": self.expired,
+            "culled": self.culled,
+            "dropped": self.dropped,
+        }
+
+    def __len__(self) -> int:
+        return len(self._active)
@@ -0,0 +1,241 @@
+import csv
+import json
+import time
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import pygame
+
+from text_cache import TextRenderer, text_renderer
+
+# frames guardados no ring buffer (10 s a 60 fps)
+DEFAULT_CAPACITY = 600
+# o overlay recalcula os percentis a cada tantos frames
+OVERLAY_REFRESH = 30
+OVERLAY_FONT_SIZE = 14
+PERCENTILES = (0.50, 0.95, 0.99)
+
+# (fase, início em segundos, duração em segundos)
+TraceEvent = Tuple[str, float, float]
+
+
+class _NullPhase:
+    # devolvido por Profiler.phase quando o profiler está desligado: o custo
+    # fica em uma chamada de método e um with vazio
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self.profiler.record(self.name, self.start, end - self.start)
+
+
+class Profiler:
+    # mede o tempo de cada fase do frame (with profiler.phase("update"): ...).
+    # O total de cada fase por frame vai para um ring buffer de tamanho fixo,
+    # de onde saem os percentis do overlay e o CSV; cada medição também vai
+    # para um ring de eventos exportado no formato de trace do Chrome
+    # (chrome://tracing ou ui.perfetto.dev).
+    enabled: bool
+    overlay: bool
+    capacity: int
+    frames: int
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        capacity: int = DEFAULT_CAPACITY,
+        renderer: TextRenderer = text_renderer,
+    ):
+        self.enabled = enabled
+        self.overlay = False
+        self.capacity = capacity
+        self.renderer = renderer
+        self.frames = 0
+
+        self._phases: Dict[str, _Phase] = {}
+        # nome da fase -> milissegundos por frame, indexado por frame % capacity
+        self._samples: Dict[str, array] = {}
+        self._frame_numbers = array("q", bytes(8 * capacity))
+        self._current: Dict[str, float] = {}
+        self._frame_start = 0.0
+        # o begin_frame do frame atual rodou com o profiler ligado. O F3 liga
+        # o profiler no meio de um frame, e esse frame não tem começo medido
+        self._in_frame = False
+        self._events: Deque[TraceEvent] = deque(maxlen=capacity * 16)
+        self._origin = time.perf_counter()
+
+        self._overlay_lines: List[pygame.Surface] = []
+
+    def phase(self, name: str):
+        if not self._in_frame:
+            return NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        # uma fase pode rodar mais de uma vez por frame (vários passos de
+        # update), então o frame guarda a soma
+        self._current[name] = self._current.get(name, 0.0) + duration * 1000
+        self._events.append((name, start, duration))
+
+    def begin_frame(self) -> None:
+        self._in_frame = self.enabled
+        if not self.enabled:
+            return
+        self._current.clear()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        end = time.perf_counter()
+        self.record("total", self._frame_start, end - self._frame_start)
+
+        cursor = self.frames % self.capacity
+        self._frame_numbers[cursor] = self.frames
+        for name in self._current:
+            if name not in self._samples:
+                self._samples[name] = array("d", bytes(8 * self.capacity))
+        for name, samples in self._samples.items():
+            samples[cursor] = self._current.get(name, 0.0)
+        self.frames += 1
+
+        if self.overlay and self.frames % OVERLAY_REFRESH == 0:
+            self._overlay_lines = []
+
+    def toggle_overlay(self) -> None:
+        self.overlay = not self.overlay
+        # o overlay precisa de medições, então ligá-lo liga o profiler
+        if self.overlay:
+            self.enabled = True
+        self._overlay_lines = []
+
+    def _window(self) -> List[int]:
+        # posições válidas do ring buffer, da mais antiga para a mais nova
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        return [frame % self.capacity for frame in range(first, self.frames)]
+
+    def percentiles(self) -> Dict[str, Tuple[float, ...]]:
+        window = self._window()
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples[index] for index in window)
+            if not ordered:
+                continue
+            result[name] = tuple(
+                ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+                for p in PERCENTILES
+            )
+        return result
+
+    def draw_overlay(self, screen: pygame.Surface) -> pygame.Rect | None:
+        if not self.overlay:
+            return None
+        if not self._overlay_lines:
+            font = self.renderer.font(OVERLAY_FONT_SIZE)
+            lines = ["fase            p50    p95    p99 (ms)"]
+            for name, values in sorted(self.percentiles().items()):
+                lines.append(
+                    f"{name:<14}" + "".join(f"{value:7.2f}" for value in values)
+                )
+            self._overlay_lines = [
+                font.render(line, True, (255, 255, 255)) for line in lines
+            ]
+
+        height = sum(line.get_height() for line in self._overlay_lines)
+        width = max(line.get_width() for line in self._overlay_lines)
+        area = pygame.Rect(10, 60, width + 8, height + 8)
+        screen.fill((0, 0, 0), area)
+        y = area.top + 4
+        for line in self._overlay_lines:
+            screen.blit(line, (area.left + 4, y))
+            y += line.get_height()
+        return area
+
+    def export_trace(self, path: str) -> None:
+        trace = [
+            {
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 1,
+                "tid": 1,
+            }
+            for name, start, duration in self._events
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+    def export_csv(self, path: str) -> None:
+        # uma linha por frame do ring buffer, uma coluna (ms) por fase
+        names = sorted(self._samples)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame"] + names)
+            for index in self._window():
+                writer.writerow(
+                    [self._frame_numbers[index]]
+                    + [f"{self._samples[name][index]:.4f}" for name in names]
+                )
+
+    def export(self, prefix: str) -> None:
+        self.export_trace(f"{prefix}.json")
+        self.export_csv(f"{prefix}.csv")
+
+
+class LatencyMeter:
+    # amostras de uma latência (ms) num ring buffer, com os mesmos percentis
+    # do overlay. O Game mede com ele o tempo entre o clique e o primeiro
+    # frame apresentado com o flash
+    capacity: int
+    count: int
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self._samples: Deque[float] = deque(maxlen=capacity)
+
+    def add(self, seconds: float) -> float:
+        milliseconds = seconds * 1000
+        self._samples.append(milliseconds)
+        self.count += 1
+        return milliseconds
+
+    def stats(self) -> Dict[str, float]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"count": 0}
+        stats = {"count": self.count}
+        for p in PERCENTILES:
+            stats[f"p{int(p * 100)}"] = ordered[
+                min(len(ordered) - 1, int(p * len(ordered)))
+            ]
+        stats["max"] = ordered[-1]
+        return stats
@@ -0,0 +1,160 @@
+import logging
+from collections import deque
+from typing import Deque, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# frames em cada janela de medição
+WINDOW = 30
+# piora quando o tempo de frame mediano passa do orçamento por essa margem
+DEGRADE_RATIO = 1.15
+# melhora quando o trabalho mediano do frame (sem as esperas do limitador e
+# do vsync) cabe nessa fração do orçamento
+UPGRADE_RATIO = 0.5
+# janelas seguidas com folga antes de melhorar um nível
+UPGRADE_HOLD = 4
+
+
+class QualityLevel:
+    # o que cada nível de qualidade desliga ou simplifica. Nenhum campo mexe
+    # na simulação: a partida é a mesma em qualquer nível
+    __slots__ = ("name", "particles", "band_step", "fast_flash", "hud_every")
+
+    name: str
+    particles: int  # partículas por fantasma derrotado
+    band_step: float  # largura das faixas de distância do GhostSpriteCache
+    fast_flash: bool  # flash num fill só, sem o blend exato (compositor.py)
+    hud_every: int  # o HUD é refeito a cada tantos frames
+
+    def __init__(
+        self,
+        name: str,
+        particles: int,
+        band_step: float,
+        fast_flash: bool,
+        hud_every: int,
+    ):
+        self.name = name
+        self.particles = particles
+        self.band_step = band_step
+        self.fast_flash = fast_flash
+        self.hud_every = hud_every
+
+
+# do mais bonito ao mais barato
+QUALITY_LEVELS: Sequence[QualityLevel] = (
+    QualityLevel("alta", particles=5, band_step=0.02, fast_flash=False, hud_every=1),
+    QualityLevel("media", particles=3, band_step=0.05, fast_flash=False, hud_every=2),
+    QualityLevel("baixa", particles=2, band_step=0.1, fast_flash=True, hud_every=4),
+    QualityLevel("minima", particles=1, band_step=0.2, fast_flash=True, hud_every=8),
+)
+
+
+def median(values: Deque[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+class QualityGovernor:
+    # compara os últimos frames com o orçamento (1 / fps alvo) e anda um
+    # nível por vez. Piora quando o tempo de frame mediano passa do
+    # orçamento; melhora quando o trabalho do frame cabe com folga por
+    # algumas janelas seguidas. A mediana ignora um soluço isolado (a janela
+    # arrastada, um GC), e depois de cada troca a medição recomeça do zero.
+    # Se um nível recém-melhorado não se sustenta, a próxima melhora espera
+    # o dobro.
+    budget: float
+    levels: Sequence[QualityLevel]
+    level: int
+    auto: bool
+    window: int
+
+    def __init__(
+        self,
+        budget: float,
+        levels: Sequence[QualityLevel] = QUALITY_LEVELS,
+        level: int = 0,
+        auto: bool = True,
+        window: int = WINDOW,
+    ):
+        self.budget = budget
+        self.levels = levels
+        self.level = level
+        self.auto = auto
+        self.window = window
+        # (segundos de partida, nível anterior, nível novo, motivo)
+        self.changes: List[Tuple[float, int, int, str]] = []
+
+        self._frames: Deque[float] = deque(maxlen=window)
+        self._work: Deque[float] = deque(maxlen=window)
+        self._headroom = 0
+        self._upgrade_hold = UPGRADE_HOLD
+        self._just_upgraded = False
+
+    @property
+    def current(self) -> QualityLevel:
+        return self.levels[self.level]
+
+    def names(self) -> List[str]:
+        return [level.name for level in self.levels]
+
+    def sample(self, frame_time: float, work_time: float, now: float = 0.0) -> bool:
+        # frame_time: duração do frame inteiro, com as esperas; work_time: só
+        # o trabalho. Devolve True quando o nível mudou
+        if not self.auto:
+            return False
+        self._frames.append(frame_time)
+        self._work.append(work_time)
+        if len(self._frames) < self.window:
+            return False
+
+        frame = median(self._frames)
+        if frame > self.budget * DEGRADE_RATIO and self.level < len(self.levels) - 1:
+            if self._just_upgraded:
+                self._upgrade_hold *= 2
+            return self.set_level(
+                self.level + 1, f"frame mediano {frame * 1000:.1f} ms", now
+            )
+
+        self._just_upgraded = False
+        work = median(self._work)
+        if work < self.budget * UPGRADE_RATIO and self.level > 0:
+            self._headroom += 1
+            if self._headroom >= self._upgrade_hold:
+                self._just_upgraded = True
+                return self.set_level(
+                    self.level - 1, f"trabalho mediano {work * 1000:.1f} ms", now
+                )
+        else:
+            self._headroom = 0
+        # janelas sem sobreposição
+        self._frames.clear()
+        self._work.clear()
+        return False
+
+    def set_level(self, level: int, reason: str = "", now: float = 0.0) -> bool:
+        level = max(0, min(level, len(self.levels) - 1))
+        previous = self.level
+        self._frames.clear()
+        self._work.clear()
+        self._headroom = 0
+        if level == previous:
+            return False
+        self.level = level
+        self.changes.append((now, previous, level, reason))
+        logger.info(
+            "qualidade %s -> %s em %.1f s (%s, orçamento %.1f ms)",
+            self.levels[previous].name,
+            self.levels[level].name,
+            now,
+            reason,
+            self.budget * 1000,
+        )
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "level": self.current.name,
+            "auto": self.auto,
+            "changes": len(self.changes),
+        }
@@ -0,0 +1,147 @@
+import argparse
+import math
+import sys
+from typing import List, Sequence
+
+import headless
+
+headless.setup()
+
+import pygame  # noqa: E402
+
+from display import display  # noqa: E402
+from game_input import ScriptFrame  # noqa: E402
+
+# diferença por canal aceita como arredondamento entre os dois backends
+DEFAULT_TOLERANCE = 8
+# fração de pixels fora da tolerância aceita por frame
+DEFAULT_MAX_DIFFERING = 0.01
+
+
+def sweep_script(frames: int, click_every: int = 45) -> List[ScriptFrame]:
+    # o visor vai e volta pela tela e clica de tempos em tempos, para que os
+    # dois backends desenhem overlay, flash, partículas e fantasmas
+    width, height = display.logical_size
+    script = []
+    for frame in range(frames):
+        x = width / 2 + math.sin(frame / 40) * (width / 2 - 60)
+        y = height / 2 + math.sin(frame / 23) * (height / 4)
+        script.append(((int(x), int(y)), frame % click_every == click_every - 1))
+    return script
+
+
+def capture(
+    backend: str,
+    script: Sequence[ScriptFrame],
+    seed: int,
+    every: int,
+    **options,
+) -> List[pygame.Surface]:
+    display.close()
+    display.backend = backend
+    game = headless.create_game(seed=seed, script=script, **options)
+    shots = []
+    for frame in range(1, len(script) + 1):
+        game.step(headless.HEADLESS_DT)
+        if not game.running:
+            break
+        if frame % every == 0:
+            shots.append(game.snapshot())
+    display.close()
+    return shots
+
+
+def opaque(surface: pygame.Surface) -> pygame.Surface:
+    # os dois backends devolvem formatos diferentes; compara em RGB de 32 bits
+    copy = pygame.Surface(surface.get_size(), 0, 32)
+    copy.blit(surface, (0, 0))
+    return copy
+
+
+def difference(a: pygame.Surface, b: pygame.Surface) -> pygame.Surface:
+    # |a - b| por canal, com dois blends de subtração saturada
+    a, b = opaque(a), opaque(b)
+    forward = a.copy()
+    forward.blit(b, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    backward = b.copy()
+    backward.blit(a, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    forward.blit(backward, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    return forward
+
+
+def compare(a: pygame.Surface, b: pygame.Surface, tolerance: int) -> dict:
+    diff = difference(a, b)
+    width, height = diff.get_size()
+    within = pygame.mask.from_threshold(
+        diff, (0, 0, 0), (tolerance + 1, tolerance + 1, tolerance + 1, 255)
+    ).count()
+    mean = pygame.transform.average_color(diff)
+    return {
+        "diff": diff,
+        "differing": 1 - within / (width * height),
+        "mean": sum(mean[:3]) / 3,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="compara pixel a pixel os backends surface e texture"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument(
+        "--every", type=int, default=30, help="compara um frame a cada N"
+    )
+    parser.add_argument("--ghost-engine", choices=("list", "numpy"), default="list")
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--max-differing",
+        type=float,
+        default=DEFAULT_MAX_DIFFERING,
+        help="fração de pixels diferentes aceita por frame",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PREFIXO",
+        help="grava PREFIXO-surface.png, PREFIXO-texture.png e PREFIXO-diff.png "
+        "do pior frame",
+    )
+    args = parser.parse_args()
+
+    pygame.init()
+    script = sweep_script(args.frames)
+    options = {"ghost_engine": args.ghost_engine}
+    expected = capture("surface", script, args.seed, args.every, **options)
+    actual = capture("texture", script, args.seed, args.every, **options)
+    if len(expected) != len(actual):
+        print("as partidas divergiram: os backends não simulam igual")
+        sys.exit(2)
+
+    worst = None
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        result = compare(a, b, args.tolerance)
+        frame = (index + 1) * args.every
+        print(
+            f"frame {frame:5d}: {result['differing'] * 100:6.2f}% diferentes, "
+            f"média {result['mean']:.2f}"
+        )
+        if worst is None or result["differing"] > worst[1]["differing"]:
+            worst = (index, result)
+
+    if worst is None:
+        print("nenhum frame comparado")
+        sys.exit(2)
+    index, result = worst
+    if args.output:
+        pygame.image.save(expected[index], f"{args.output}-surface.png")
+        pygame.image.save(actual[index], f"{args.output}-texture.png")
+        # realça a diferença para ficar visível
+        result["diff"].fill((16, 16, 16), special_flags=pygame.BLEND_RGB_MULT)
+        pygame.image.save(result["diff"], f"{args.output}-diff.png")
+    passed = result["differing"] <= args.max_differing
+    print(
+        f"pior frame {(index + 1) * args.every}: "
+        f"{result['differing'] * 100:.2f}% ({'ok' if passed else 'acima do limite'})"
+    )
+    pygame.quit()
+    sys.exit(0 if passed else 1)
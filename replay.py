@@ -0,0 +1,277 @@
+import argparse
+import json
+import math
+import random
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, List, Tuple
+
+import pygame
+
+# cabeçalho: assinatura, versão, semente do RNG, dt do passo, número de frames
+# e tamanho das opções da partida (JSON, logo depois do cabeçalho)
+MAGIC = b"PIRP"
+# 2: partida na tela lógica de 960x540 (display.py); gravações da 1 não batem
+# 3: a foto é resolvida no frame do clique, antes dos passos de simulação
+# 4: as partículas têm um RNG próprio, fora da sequência da partida
+# 5: as opções do Game que mudam a simulação vão junto na gravação
+# 6: a hora de cada clique, para o intervalo da câmera decidir igual
+VERSION = 6
+HEADER = struct.Struct("<4sBQdII")
+# um frame: cliques (7 bits) e QUIT (bit mais alto), passos de simulação e
+# posição do mouse
+FRAME = struct.Struct("<BBhh")
+# depois dos frames, o carimbo (.time do evento) de cada clique gravado, na
+# ordem; NaN quando a entrada não carimba os eventos
+CLICK_TIME = struct.Struct("<d")
+QUIT_FLAG = 0x80
+MAX_CLICKS = 0x7F
+
+# opções do Game que mudam a partida: o replay usa as da gravação
+SIMULATION_OPTIONS = (
+    "max_ghosts",
+    "spawn_rate",
+    "ghost_hp",
+    "ghost_speed",
+    "click_delay",
+    "invulnerability",
+    "pixel_collision",
+)
+
+# (cliques, quit, passos, (x, y))
+RecordedFrame = Tuple[int, bool, int, Tuple[int, int]]
+
+
+def normalize(options: Dict) -> Dict:
+    # como as opções ficam depois de ir e voltar do JSON (tuplas viram listas)
+    return json.loads(json.dumps(options))
+
+
+class Recording:
+    # entrada de uma partida, frame a frame, mais a semente do RNG, o dt da
+    # simulação e as opções da partida: é tudo o que o Game precisa para
+    # refazer a partida igual
+    seed: int
+    dt: float
+    options: Dict
+    frames: List[RecordedFrame]
+    click_times: List[float]
+
+    def __init__(
+        self,
+        seed: int,
+        dt: float,
+        frames: List[RecordedFrame] | None = None,
+        options: Dict | None = None,
+        click_times: List[float] | None = None,
+    ):
+        self.seed = seed
+        self.dt = dt
+        self.options = normalize(options or {})
+        self.frames = frames if frames is not None else []
+        self.click_times = click_times if click_times is not None else []
+
+    def save(self, path: str) -> None:
+        body = bytearray()
+        for clicks, quit, steps, (x, y) in self.frames:
+            flags = min(clicks, MAX_CLICKS) | (QUIT_FLAG if quit else 0)
+            body += FRAME.pack(flags, steps, x, y)
+        for stamp in self.click_times:
+            body += CLICK_TIME.pack(stamp)
+        options = json.dumps(self.options).encode()
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC, VERSION, self.seed, self.dt, len(self.frames), len(options)
+                )
+            )
+            file.write(options)
+            # o mouse parado repete os mesmos bytes por muitos frames
+            file.write(zlib.compress(bytes(body), 9))
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError(f"{path} não é uma gravação suportada")
+        _, _, seed, dt, count, size = HEADER.unpack_from(data)
+
+        start = HEADER.size + size
+        options = json.loads(data[HEADER.size : start])
+        body = zlib.decompress(data[start:])
+        frames = []
+        for flags, steps, x, y in FRAME.iter_unpack(body[: count * FRAME.size]):
+            frames.append((flags & MAX_CLICKS, bool(flags & QUIT_FLAG), steps, (x, y)))
+        click_times = [
+            stamp for (stamp,) in CLICK_TIME.iter_unpack(body[count * FRAME.size :])
+        ]
+        return cls(seed, dt, frames, options, click_times)
+
+
+class InputRecorder:
+    # fonte de entrada que repassa outra (a do pygame, normalmente) e grava o
+    # que o Game viu em cada frame. O Game chama commit com o número de passos
+    # de simulação do frame, que no loop ao vivo depende do relógio.
+    def __init__(self, source, seed: int, dt: float, options: Dict | None = None):
+        self.source = source
+        self.recording = Recording(seed, dt, options=options)
+        self._pending: Tuple[int, bool] = (0, False)
+        self._pos = (0, 0)
+
+    def events(self) -> List[pygame.event.Event]:
+        events = self.source.events()
+        clicks = 0
+        quit = False
+        for event in events:
+            if (
+                event.type == pygame.MOUSEBUTTONDOWN
+                and event.button == pygame.BUTTON_LEFT
+            ):
+                if clicks < MAX_CLICKS:
+                    stamp = getattr(event, "time", None)
+                    self.recording.click_times.append(
+                        math.nan if stamp is None else stamp
+                    )
+                clicks += 1
+            elif event.type == pygame.QUIT:
+                quit = True
+        # o pygame só atualiza a posição do mouse ao ler a fila, então ela é a
+        # mesma em todos os passos do frame
+        self._pos = tuple(self.source.mouse_pos())
+        self._pending = (clicks, quit)
+        return events
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return self._pos
+
+    def commit(self, steps: int) -> None:
+        clicks, quit = self._pending
+        self.recording.frames.append((clicks, quit, steps, self._pos))
+
+    def save(self, path: str) -> None:
+        self.recording.save(path)
+
+
+class ReplayInput:
+    # fonte de entrada que devolve os frames de uma gravação. Ao fim da
+    # gravação manda um QUIT. Os cliques levam em .time o carimbo gravado,
+    # então o Game aceita e recusa os mesmos cliques da partida original
+    recording: Recording
+    frame: int
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.frame = -1
+        self._pos = recording.frames[0][3] if recording.frames else (0, 0)
+        self._click_times = iter(recording.click_times)
+
+    def next_steps(self) -> int:
+        # passos de simulação do próximo frame, antes do events() avançar
+        frames = self.recording.frames
+        if self.frame + 1 < len(frames):
+            return frames[self.frame + 1][2]
+        return 0
+
+    def events(self) -> List[pygame.event.Event]:
+        self.frame += 1
+        if self.frame >= len(self.recording.frames):
+            return [pygame.event.Event(pygame.QUIT)]
+
+        clicks, quit, _, self._pos = self.recording.frames[self.frame]
+        events = []
+        for _ in range(clicks):
+            event = pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, button=pygame.BUTTON_LEFT, pos=self._pos
+            )
+            stamp = next(self._click_times, math.nan)
+            if not math.isnan(stamp):
+                event.time = stamp
+            events.append(event)
+        if quit:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return self._pos
+
+
+def replay(recording: Recording, headless: bool = True, **options):
+    # refaz a partida o mais rápido possível, sem limitador de fps, com as
+    # opções da gravação. Devolve o Game no estado final.
+    given = normalize(
+        {name: options[name] for name in SIMULATION_OPTIONS if name in options}
+    )
+    conflicts = [
+        name
+        for name, value in given.items()
+        if name in recording.options and value != recording.options[name]
+    ]
+    if conflicts:
+        raise ValueError(f"opções diferentes das da gravação: {', '.join(conflicts)}")
+    options = dict(options, **recording.options)
+    if headless:
+        import headless as headless_mode
+
+        headless_mode.setup()
+    from main import Game
+
+    source = ReplayInput(recording)
+    game = Game(
+        headless=headless,
+        rng=random.Random(recording.seed),
+        input_source=source,
+        **options,
+    )
+    while game.running:
+        game.advance_frame(source.next_steps(), recording.dt)
+    return game
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="refaz uma partida gravada com main.py --record"
+    )
+    parser.add_argument("gravacao")
+    parser.add_argument(
+        "--window", action="store_true", help="mostra a partida numa janela"
+    )
+    parser.add_argument(
+        "--ghost-engine",
+        choices=("list", "numpy"),
+        default="list",
+        help="numpy guarda os fantasmas em arrays (requer uv sync --extra fast)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PREFIXO",
+        help="grava PREFIXO.json (trace do Chrome) e PREFIXO.csv",
+    )
+    args = parser.parse_args()
+
+    recording = Recording.load(args.gravacao)
+    start = time.perf_counter()
+    game = replay(
+        recording,
+        headless=not args.window,
+        ghost_engine=args.ghost_engine,
+        profile=args.profile_output is not None,
+    )
+    elapsed = time.perf_counter() - start
+    if args.profile_output is not None:
+        game.profiler.export(args.profile_output)
+
+    frames = len(recording.frames)
+    print(
+        f"{frames} frames em {elapsed:.2f} s ({frames / elapsed:.0f} fps), "
+        f"{game.elapsed:.1f} s de jogo, hp {game.hp}, "
+        f"pontos {game.points_red}/{game.points_green}/{game.points_blue}, "
+        f"{len(game.ghosts)} fantasmas",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from typing import List, Tuple
+
+
+class Scene:
+    # uma tela do jogo (menu, créditos, partida, game over). O SceneManager
+    # chama enter ao empilhar, step a cada volta do loop enquanto ela estiver
+    # no topo, pause/resume quando outra cena entra ou sai por cima dela e
+    # exit ao desempilhar, que é onde a cena solta o que carregou.
+    manager: "SceneManager"
+
+    def enter(self) -> None:
+        pass
+
+    def exit(self) -> None:
+        pass
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    def step(self) -> None:
+        raise NotImplementedError
+
+
+class SceneManager:
+    # pilha de cenas rodada por um único loop. As trocas pedidas durante um
+    # step (push, pop, replace, quit) só são aplicadas depois dele, então a
+    # cena que pediu termina o step antes de sair. A janela e os assets ficam
+    # fora das cenas e sobrevivem às trocas.
+    stack: List[Scene]
+
+    def __init__(self):
+        self.stack = []
+        self._pending: List[Tuple[str, Scene | None]] = []
+
+    @property
+    def top(self) -> Scene | None:
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene: Scene) -> None:
+        self._pending.append(("push", scene))
+
+    def pop(self) -> None:
+        self._pending.append(("pop", None))
+
+    def replace(self, scene: Scene) -> None:
+        self._pending.append(("pop", None))
+        self._pending.append(("push", scene))
+
+    def quit(self) -> None:
+        self._pending.append(("quit", None))
+
+    def _apply(self) -> None:
+        while self._pending:
+            action, scene = self._pending.pop(0)
+            if action == "push":
+                if self.stack:
+                    self.stack[-1].pause()
+                scene.manager = self
+                self.stack.append(scene)
+                scene.enter()
+            elif action == "pop":
+                if self.stack:
+                    self.stack.pop().exit()
+                # num replace a próxima ação é o push, e a cena de baixo não
+                # chega a voltar
+                replacing = self._pending and self._pending[0][0] == "push"
+                if self.stack and not replacing:
+                    self.stack[-1].resume()
+            elif action == "quit":
+                self._pending.clear()
+                while self.stack:
+                    self.stack.pop().exit()
+
+    def run(self, scene: Scene) -> None:
+        self.push(scene)
+        self._apply()
+        while self.stack:
+            self.stack[-1].step()
+            self._apply()
@@ -0,0 +1,95 @@
+from typing import Tuple
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # o numpy é opcional (uv sync --extra fast)
+    np = None
+
+# 128 px por célula (1 << 7): os fantasmas têm de ~80 a 190 px, então uma
+# consulta do tamanho do visor olha poucas células
+CELL_SHIFT = 7
+
+
+def overlap(x, y, size, rect: pygame.Rect, contains: bool):
+    # máscara dos hitboxes (x, y, size) que tocam o retângulo ou, com
+    # contains, que cabem inteiros nele
+    if contains:
+        return (
+            (x >= rect.left)
+            & (y >= rect.top)
+            & (x + size <= rect.right)
+            & (y + size <= rect.bottom)
+        )
+    return (
+        (x < rect.right)
+        & (y < rect.bottom)
+        & (x + size > rect.left)
+        & (y + size > rect.top)
+    )
+
+
+class SpatialGrid:
+    # grade uniforme sobre os hitboxes do GhostEngine, refeita de uma vez a
+    # cada passo em vez de ser avisada a cada movimento. Cada fantasma cai na
+    # célula do canto superior esquerdo do hitbox (fora dos limites vai para
+    # a célula da borda), e a consulta só faz o teste exato nos fantasmas das
+    # células que o retângulo toca, alargadas pelo maior fantasma.
+    #
+    # Na tela lógica cabem só 8x5 células, então as células ficam como um
+    # byte por fantasma em vez de listas por célula: comparar esses bytes
+    # custa menos que ordenar os fantasmas por célula a cada passo (ver
+    # benchmarks/bench_queries.py), e as posições já saem em ordem.
+    bounds: pygame.Rect
+    cols: int
+    rows: int
+
+    def __init__(self, bounds: pygame.Rect, shift: int = CELL_SHIFT):
+        self.bounds = pygame.Rect(bounds)
+        self.shift = shift
+        cell = 1 << shift
+        self.cols = max(1, -(-self.bounds.w // cell))
+        self.rows = max(1, -(-self.bounds.h // cell))
+        self._cell = np.uint8 if max(self.cols, self.rows) <= 255 else np.int32
+        self.max_size = 0
+        # hitbox e célula de cada posição do array passado ao build
+        self._x = self._y = self._size = np.zeros(0, dtype=np.int32)
+        self._column = self._row = np.zeros(0, dtype=self._cell)
+
+    def build(self, topleft, size) -> None:
+        # topleft e size de cada fantasma, na ordem em que as posições devem
+        # ser devolvidas
+        self.max_size = int(size.max()) if len(size) else 0
+        # uma coluna por vez: as operações sobre o array (n, 2) inteiro fazem
+        # laços internos de 2 elementos e saem várias vezes mais lentas
+        self._x = topleft[:, 0].astype(np.int32)
+        self._y = topleft[:, 1].astype(np.int32)
+        self._size = size
+        column = (self._x - self.bounds.left) >> self.shift
+        row = (self._y - self.bounds.top) >> self.shift
+        self._column = np.clip(column, 0, self.cols - 1).astype(self._cell)
+        self._row = np.clip(row, 0, self.rows - 1).astype(self._cell)
+
+    def _cells(self, low: int, high: int, origin: int, count: int) -> Tuple[int, int]:
+        shift = self.shift
+        first = min(max((low - origin) >> shift, 0), count - 1)
+        last = min(max((high - origin) >> shift, 0), count - 1)
+        return first, last
+
+    def query(self, rect: pygame.Rect, contains: bool = False):
+        # um fantasma cujo canto está até max_size antes do retângulo ainda
+        # pode tocá-lo
+        x0, x1 = self._cells(
+            rect.left - self.max_size, rect.right - 1, self.bounds.left, self.cols
+        )
+        y0, y1 = self._cells(
+            rect.top - self.max_size, rect.bottom - 1, self.bounds.top, self.rows
+        )
+        column = self._column
+        row = self._row
+        near = np.flatnonzero(
+            (column >= x0) & (column <= x1) & (row >= y0) & (row <= y1)
+        )
+        mask = overlap(self._x[near], self._y[near], self._size[near], rect, contains)
+        return near[mask]
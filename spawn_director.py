@@ -0,0 +1,78 @@
+from typing import Callable, Sequence, Sized, Tuple
+
+# curvas das ondas: pontos (tempo de jogo em segundos, valor), interpolados
+# linearmente e presos nas pontas
+Curve = Sequence[Tuple[float, float]]
+
+# segundos entre uma onda e a próxima
+WAVE_INTERVAL: Curve = ((0, 5.0), (120, 3.5), (300, 2.5))
+# fantasmas por onda
+WAVE_SIZE: Curve = ((0, 3), (120, 4), (300, 6))
+# acima disso a onda é cortada, a partida não acumula fantasmas sem fim
+MAX_ALIVE = 30
+
+
+def curve_at(curve: Curve, t: float) -> float:
+    if t <= curve[0][0]:
+        return curve[0][1]
+    for (t0, v0), (t1, v1) in zip(curve, curve[1:]):
+        if t <= t1:
+            return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+    return curve[-1][1]
+
+
+class SpawnDirector:
+    # decide quando e quantos fantasmas entram: uma onda a cada
+    # WAVE_INTERVAL(t) segundos, com WAVE_SIZE(t) fantasmas, sem passar de
+    # max_alive vivos. Quem cria o fantasma é o spawn recebido (o Game), e os
+    # fantasmas mortos são reaproveitados pela coleção (GhostList.pool ou os
+    # slots livres do GhostEngine).
+    max_alive: int
+    next_wave: float
+    waves: int
+    spawned: int
+    capped: int
+
+    def __init__(
+        self,
+        ghosts: Sized,
+        spawn: Callable[[], object],
+        interval: Curve = WAVE_INTERVAL,
+        size: Curve = WAVE_SIZE,
+        max_alive: int = MAX_ALIVE,
+    ):
+        self.ghosts = ghosts
+        self.spawn = spawn
+        self.interval = interval
+        self.size = size
+        self.max_alive = max_alive
+
+        self.next_wave = curve_at(interval, 0)
+        self.waves = 0
+        self.spawned = 0
+        # fantasmas que ficaram de fora por causa do limite
+        self.capped = 0
+
+    def update(self, elapsed: float) -> int:
+        if elapsed <= self.next_wave:
+            return 0
+        self.next_wave = elapsed + curve_at(self.interval, elapsed)
+        self.waves += 1
+
+        wanted = round(curve_at(self.size, elapsed))
+        count = max(0, min(wanted, self.max_alive - len(self.ghosts)))
+        self.capped += wanted - count
+        for _ in range(count):
+            self.spawn()
+        self.spawned += count
+        return count
+
+    def stats(self) -> dict:
+        return {
+            "alive": len(self.ghosts),
+            "max_alive": self.max_alive,
+            "waves": self.waves,
+            "spawned": self.spawned,
+            "capped": self.capped,
+            "recycled": getattr(self.ghosts, "recycled", 0),
+        }
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+# chave: (tipo do fantasma, buff, faixa de distância)
+SpriteKey = Tuple[int, int, int]
+
+
+class GhostSpriteCache:
+    # guarda os sprites dos fantasmas já escalados e escurecidos por faixa de
+    # distância, como uma mip chain preenchida sob demanda. O draw só faz blit.
+    base_size: float
+    band_step: float
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, base_size: float, band_step: float = 0.02, capacity: int = 256):
+        self.base_size = base_size
+        self.band_step = band_step
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sprites: OrderedDict[SpriteKey, pygame.Surface] = OrderedDict()
+
+    def set_band_step(self, band_step: float) -> None:
+        # faixas mais largas: menos sprites diferentes para escalar (ver
+        # quality.py); as chaves mudam, então o cache recomeça
+        if band_step != self.band_step:
+            self.band_step = band_step
+            self.clear()
+
+    def band(self, distance: float) -> int:
+        return round(distance / self.band_step)
+
+    def band_distance(self, band: int) -> float:
+        return max(band * self.band_step, self.band_step)
+
+    def get(
+        self, type: int, buff: int, distance: float, base_image: pygame.Surface
+    ) -> pygame.Surface:
+        key = (type, buff, self.band(distance))
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self._build(base_image, self.band_distance(key[2]))
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.capacity:
+            self._sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def measure(
+        self, base_image: pygame.Surface, distance: float
+    ) -> Tuple[Tuple[int, int], int]:
+        # tamanho e brilho do sprite na faixa da distância; o backend de
+        # texturas (texture_renderer.py) escala e tinge na GPU com os mesmos
+        # valores
+        distance = self.band_distance(self.band(distance))
+        size = self.base_size / (distance**2)
+        scale_factor = size / max(base_image.get_size())
+        # fantasmas mais distantes ficam mais escuros
+        brightness = min(255, int(255 / distance**2))
+        return (
+            int(base_image.get_width() * scale_factor),
+            int(base_image.get_height() * scale_factor),
+        ), brightness
+
+    def _build(self, base_image: pygame.Surface, distance: float) -> pygame.Surface:
+        size, brightness = self.measure(base_image, distance)
+        sprite = pygame.transform.scale(base_image, size)
+        if brightness < 255:
+            sprite.fill(
+                (brightness, brightness, brightness),
+                special_flags=pygame.BLEND_RGB_MULT,
+            )
+        return sprite
+
+    def clear(self) -> None:
+        self._sprites.clear()
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._sprites),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,6 @@
+import time
+
+# referência para os tempos de inicialização (primeiro frame e interativo).
+# O main.py importa este módulo antes de todos os outros, então o relógio
+# começa antes de carregar o pygame
+STARTED_AT = time.perf_counter()
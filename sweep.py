@@ -0,0 +1,400 @@
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import headless
+
+headless.setup()
+
+import pygame  # noqa: E402
+
+from display import display  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# limite de uma partida simulada (segundos de jogo)
+MAX_TIME = 300.0
+# linhas acumuladas antes de cada escrita no arquivo
+BATCH_SIZE = 256
+# velocidade do visor dos jogadores simulados (pixels por segundo)
+AIM_SPEED = 900
+
+
+def parse_range(text: str) -> Tuple[float, float]:
+    low, high = text.split(":")
+    return float(low), float(high)
+
+
+def parse_flag(text: str) -> bool:
+    return text.lower() in ("1", "sim", "true")
+
+
+def parse_hp(text: str) -> Tuple[int, int, int]:
+    # vermelho:verde:azul, na ordem dos valores de buff do main.py
+    red, green, blue = (int(value) for value in text.split(":"))
+    return red, green, blue
+
+
+# parâmetro do Game -> conversor do valor dado na linha de comando
+PARAMETERS: Dict[str, Callable[[str], object]] = {
+    "spawn_rate": float,
+    "max_ghosts": int,
+    "ghost_speed": parse_range,
+    "ghost_hp": parse_hp,
+    "click_delay": int,
+    "invulnerability": float,
+    "pixel_collision": parse_flag,
+}
+
+
+def parse_grid(specs: Sequence[str]) -> Dict[str, List[object]]:
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in PARAMETERS or not values:
+            raise SystemExit(
+                f"parâmetro inválido {spec!r}; use nome=v1,v2 com nome em "
+                + ", ".join(PARAMETERS)
+            )
+        grid[name] = [PARAMETERS[name](value) for value in values.split(",")]
+    return grid
+
+
+def combinations(grid: Dict[str, List[object]]) -> List[Dict[str, object]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def column(value) -> object:
+    # tuplas viram texto ("20:40") para o arquivo ter colunas simples
+    if isinstance(value, tuple):
+        return ":".join(f"{item:g}" for item in value)
+    return value
+
+
+class IdlePolicy:
+    # jogador parado no meio da tela, sem clicar: a linha de base
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.game = None
+        width, height = display.logical_size
+        self.position = pygame.Vector2(width / 2, height / 2)
+
+    def attach(self, game) -> None:
+        self.game = game
+
+    def events(self) -> List[pygame.event.Event]:
+        return []
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return int(self.position.x), int(self.position.y)
+
+    def click(self) -> List[pygame.event.Event]:
+        return [
+            pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN,
+                button=pygame.BUTTON_LEFT,
+                pos=self.mouse_pos(),
+            )
+        ]
+
+    def move_towards(self, target, dt: float = headless.HEADLESS_DT) -> None:
+        self.position.move_towards_ip(target, AIM_SPEED * dt)
+
+
+class RandomPolicy(IdlePolicy):
+    # o visor passeia entre pontos sorteados e clica ao acaso
+    click_chance = 0.03
+
+    def __init__(self, rng: random.Random):
+        super().__init__(rng)
+        self.target = self.position.copy()
+
+    def events(self) -> List[pygame.event.Event]:
+        if self.position == self.target:
+            width, height = display.logical_size
+            self.target = pygame.Vector2(
+                self.rng.uniform(0, width), self.rng.uniform(0, height)
+            )
+        self.move_towards(self.target)
+        if self.rng.random() < self.click_chance:
+            return self.click()
+        return []
+
+
+class AimPolicy(IdlePolicy):
+    # mira no fantasma mais perto do jogador e clica quando ele está inteiro
+    # dentro do visor, como alguém jogando com atenção
+    def events(self) -> List[pygame.event.Event]:
+        game = self.game
+        player = game.player.position
+        target = min(
+            game.ghosts,
+            key=lambda ghost: player.distance_squared_to(ghost.hitbox.center),
+            default=None,
+        )
+        if target is None:
+            return []
+        self.move_towards(target.hitbox.center)
+        if game.captured():
+            return self.click()
+        return []
+
+
+POLICIES = {"idle": IdlePolicy, "random": RandomPolicy, "aim": AimPolicy}
+
+
+def simulate(job: Tuple[Dict[str, object], int, str, float, bool]) -> dict:
+    # uma partida do começo até o game over (ou até max_time); roda num
+    # processo do pool
+    params, seed, policy_name, max_time, draw = job
+    from main import AZUL, VERDE, VERMELHO, Game
+
+    # a política tem um RNG próprio para não mexer na sequência do jogo
+    policy = POLICIES[policy_name](random.Random(seed ^ 0x5EED))
+    game = Game(
+        headless=True,
+        rng=random.Random(seed),
+        input_source=policy,
+        fixed_dt=headless.HEADLESS_DT,
+        render=draw,
+        **params,
+    )
+    policy.attach(game)
+
+    frames = 0
+    peak = len(game.ghosts)
+    cost = 0.0
+    limit = int(max_time / headless.HEADLESS_DT)
+    while game.running and frames < limit:
+        start = time.perf_counter()
+        game.step(headless.HEADLESS_DT)
+        cost += time.perf_counter() - start
+        frames += 1
+        peak = max(peak, len(game.ghosts))
+
+    row = {name: column(value) for name, value in params.items()}
+    row.update(
+        seed=seed,
+        policy=policy_name,
+        survived=not game.game_over,
+        survival_s=round(game.elapsed, 3),
+        kills_red=game.kills[VERMELHO],
+        kills_green=game.kills[VERDE],
+        kills_blue=game.kills[AZUL],
+        spawned=game.director.spawned,
+        peak_ghosts=peak,
+        frames=frames,
+        mean_frame_ms=cost / frames * 1000 if frames else 0.0,
+    )
+    return row
+
+
+class ResultWriter:
+    # grava as linhas em lotes, conforme as partidas terminam: Parquet (com
+    # pyarrow, uv sync --extra sweep) ou CSV
+    path: str
+    rows: int
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batch: List[dict] = []
+        self._writer = None
+        self._file = None
+
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                path = os.path.splitext(path)[0] + ".csv"
+                logger.warning("pyarrow não instalado, gravando %s", path)
+                self.parquet = False
+        self.path = path
+
+    def write(self, row: dict) -> None:
+        self._batch.append(row)
+        self.rows += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._batch:
+            return
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._writer is None:
+                table = pa.Table.from_pylist(self._batch)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pylist(self._batch, self._writer.schema)
+            self._writer.write_table(table)
+        else:
+            if self._writer is None:
+                self._file = open(self.path, "w", newline="")
+                self._writer = csv.DictWriter(self._file, fieldnames=self._batch[0])
+                self._writer.writeheader()
+            self._writer.writerows(self._batch)
+            self._file.flush()
+        self._batch = []
+
+    def close(self) -> None:
+        self.flush()
+        if self.parquet and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class Aggregate:
+    # resumo por combinação de parâmetros, acumulado enquanto as linhas chegam
+    def __init__(self):
+        self.runs = 0
+        self.survived = 0
+        self.survival: List[float] = []
+        self.kills = [0, 0, 0]
+        self.peak = 0
+        self.peak_total = 0
+        self.frame_ms = 0.0
+
+    def add(self, row: dict) -> None:
+        self.runs += 1
+        self.survived += row["survived"]
+        self.survival.append(row["survival_s"])
+        self.kills[0] += row["kills_red"]
+        self.kills[1] += row["kills_green"]
+        self.kills[2] += row["kills_blue"]
+        self.peak = max(self.peak, row["peak_ghosts"])
+        self.peak_total += row["peak_ghosts"]
+        self.frame_ms += row["mean_frame_ms"]
+
+    def summary(self) -> dict:
+        runs = self.runs
+        return {
+            "runs": runs,
+            "survived": self.survived / runs,
+            "survival_mean_s": statistics.fmean(self.survival),
+            "survival_p50_s": statistics.median(self.survival),
+            "kills_red": self.kills[0] / runs,
+            "kills_green": self.kills[1] / runs,
+            "kills_blue": self.kills[2] / runs,
+            "peak_ghosts_mean": self.peak_total / runs,
+            "peak_ghosts_max": self.peak,
+            "frame_ms": self.frame_ms / runs,
+        }
+
+
+def run(
+    jobs: Sequence[tuple],
+    writer: ResultWriter,
+    workers: int | None,
+    progress: Callable[[int], None] = lambda done: None,
+) -> Dict[Tuple, Aggregate]:
+    aggregates: Dict[Tuple, Aggregate] = {}
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(workers, initializer=headless.setup) as pool:
+        for done, (job, row) in enumerate(
+            zip(jobs, pool.map(simulate, jobs, chunksize=chunksize)), 1
+        ):
+            writer.write(row)
+            key = tuple((name, column(value)) for name, value in job[0].items())
+            aggregates.setdefault(key, Aggregate()).add(row)
+            progress(done)
+    writer.close()
+    return aggregates
+
+
+def report(aggregates: Dict[Tuple, Aggregate]) -> List[dict]:
+    summaries = [
+        {**dict(key), **aggregate.summary()} for key, aggregate in aggregates.items()
+    ]
+    summaries.sort(key=lambda summary: summary["survival_mean_s"], reverse=True)
+    return summaries
+
+
+def print_report(summaries: Iterable[dict], parameters: Sequence[str]) -> None:
+    for summary in summaries:
+        label = " ".join(f"{name}={summary[name]}" for name in parameters) or "padrão"
+        print(
+            f"{label}: {summary['runs']} partidas, "
+            f"sobrevive {summary['survived'] * 100:.0f}%, "
+            f"tempo {summary['survival_mean_s']:.1f}s (p50 {summary['survival_p50_s']:.1f}s), "
+            f"abates r/g/b {summary['kills_red']:.1f}/{summary['kills_green']:.1f}/"
+            f"{summary['kills_blue']:.1f}, pico {summary['peak_ghosts_mean']:.1f} "
+            f"(máx {summary['peak_ghosts_max']}), frame {summary['frame_ms']:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="roda partidas headless em paralelo variando o balanceamento"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NOME=V1,V2",
+        help="valores de um parâmetro do Game: "
+        + ", ".join(PARAMETERS)
+        + " (faixas como 20:40, hp por buff como vermelho:verde:azul,"
+        " pixel_collision como 0,1)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=20, help="partidas (sementes) por combinação"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="primeira semente")
+    parser.add_argument("--policy", choices=POLICIES, default="aim")
+    parser.add_argument("--max-time", type=float, default=MAX_TIME)
+    parser.add_argument(
+        "--draw", action="store_true", help="desenha os frames (mede o custo do draw)"
+    )
+    parser.add_argument("--workers", type=int, help="processos (padrão: um por núcleo)")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="sweep.parquet",
+        help=".parquet (precisa de pyarrow) ou .csv, uma linha por partida",
+    )
+    parser.add_argument("--summary", metavar="ARQUIVO", help="grava o resumo em JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    grid = parse_grid(args.param)
+    jobs = [
+        (params, seed, args.policy, args.max_time, args.draw)
+        for params in combinations(grid)
+        for seed in range(args.seed, args.seed + args.runs)
+    ]
+    writer = ResultWriter(args.output)
+    started = time.perf_counter()
+    step = max(1, len(jobs) // 20)
+
+    def progress(done: int) -> None:
+        if done % step == 0 or done == len(jobs):
+            print(f"{done}/{len(jobs)} partidas", file=sys.stderr)
+
+    aggregates = run(jobs, writer, args.workers, progress)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{writer.rows} partidas em {elapsed:.1f}s "
+        f"({writer.rows / elapsed:.1f}/s), resultados em {writer.path}",
+        file=sys.stderr,
+    )
+
+    summaries = report(aggregates)
+    print_report(summaries, list(grid))
+    if args.summary:
+        with open(args.summary, "w") as file:
+            json.dump(summaries, file, indent=1)
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+import pygame
+
+from asset_registry import AssetRegistry, assets
+
+DIGITS = "0123456789-"
+
+ColorKey = Tuple[int, int, int, int]
+
+
+def color_key(color) -> ColorKey:
+    return tuple(pygame.Color(color))
+
+
+class DigitAtlas:
+    # todos os dígitos de uma fonte/cor rasterizados uma vez numa surface só;
+    # um número é montado com blits de pedaços dela
+    surface: pygame.Surface
+    glyphs: Dict[str, pygame.Rect]
+
+    def __init__(self, font: pygame.font.Font, color: ColorKey):
+        rendered = [font.render(digit, True, color) for digit in DIGITS]
+        width = sum(glyph.get_width() for glyph in rendered)
+        height = max(glyph.get_height() for glyph in rendered)
+
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.glyphs = {}
+        x = 0
+        for digit, glyph in zip(DIGITS, rendered):
+            self.glyphs[digit] = self.surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+    def compose(self, digits: str) -> pygame.Surface:
+        width = sum(self.glyphs[digit].width for digit in digits)
+        surface = pygame.Surface((width, self.surface.get_height()), pygame.SRCALPHA)
+        x = 0
+        for digit in digits:
+            area = self.glyphs[digit]
+            surface.blit(self.surface, (x, 0), area)
+            x += area.width
+        return surface
+
+
+class TextRenderer:
+    # cada fonte/tamanho é aberta uma vez (pelo registro de assets) e cada
+    # texto renderizado fica em cache até ser despejado pelo LRU
+    font_key: str
+    capacity: int
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        registry: AssetRegistry = assets,
+        font_key: str = "alagard",
+        capacity: int = 128,
+    ):
+        self.registry = registry
+        self.font_key = font_key
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+        self._atlases: Dict[Tuple[ColorKey, int], DigitAtlas] = {}
+
+    def font(self, size: int) -> pygame.font.Font:
+        return self.registry.font(self.font_key, size)
+
+    def render(self, text: str, color, size: int) -> pygame.Surface:
+        key = (text, color_key(color), size)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self.font(size).render(text, True, key[1])
+            self._store(key, surface)
+        return surface
+
+    def render_number(self, value: int, color, size: int) -> pygame.Surface:
+        color = color_key(color)
+        key = ("#", value, color, size)
+        surface = self._lookup(key)
+        if surface is None:
+            atlas = self._atlases.get((color, size))
+            if atlas is None:
+                atlas = DigitAtlas(self.font(size), color)
+                self._atlases[(color, size)] = atlas
+            surface = atlas.compose(str(value))
+            self._store(key, surface)
+        return surface
+
+    def _lookup(self, key: Hashable) -> pygame.Surface | None:
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def _store(self, key: Hashable, surface: pygame.Surface) -> None:
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self._atlases.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._surfaces),
+            "capacity": self.capacity,
+            "atlases": len(self._atlases),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+text_renderer = TextRenderer()
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from typing import List, Tuple
+
+import pygame
+from pygame._sdl2 import video
+
+from compositor import OVERLAY_ALPHA, Compositor
+from sprite_cache import GhostSpriteCache
+
+# modos de blend do SDL (SDL_BlendMode)
+BLENDMODE_NONE = 0
+BLENDMODE_BLEND = 1
+# texturas guardadas por surface de origem (imagens, partículas e HUD)
+TEXTURE_CACHE_SIZE = 128
+
+
+class TextureRenderer:
+    # desenha a partida com o Renderer do SDL (--renderer texture). Cada
+    # imagem vira textura uma única vez; a escala e o escurecimento dos
+    # fantasmas (color mod), o escurecimento fora do visor e o flash são
+    # feitos pelo renderer na hora de desenhar, sem nenhuma surface
+    # intermediária na CPU. O resultado deve bater com o Game.render, e o
+    # render_compare.py confere isso pixel a pixel.
+    renderer: video.Renderer
+    sprites: GhostSpriteCache
+    capacity: int
+    uploads: int
+
+    def __init__(
+        self,
+        renderer: video.Renderer,
+        sprites: GhostSpriteCache,
+        capacity: int = TEXTURE_CACHE_SIZE,
+    ):
+        self.renderer = renderer
+        self.sprites = sprites
+        self.capacity = capacity
+        self.uploads = 0
+        # id da surface -> (surface, textura); a surface fica guardada junto
+        # para que o id não seja reaproveitado por outra enquanto em cache
+        self._textures: OrderedDict[int, Tuple[pygame.Surface, video.Texture]] = (
+            OrderedDict()
+        )
+        # overlay do profiler: desenhado em software no _scratch e enviado
+        # para uma textura de streaming criada uma vez só
+        self._scratch: pygame.Surface | None = None
+        self._overlay: video.Texture | None = None
+        # HUD do último draw, redesenhado pelo snapshot sem pedir outro ao
+        # Game (o que contaria mais um frame na idade do HUD)
+        self._hud: List[Tuple[str, pygame.Surface, Tuple[int, int]]] | None = None
+
+    def texture(self, surface: pygame.Surface) -> video.Texture:
+        key = id(surface)
+        entry = self._textures.get(key)
+        if entry is not None:
+            self._textures.move_to_end(key)
+            return entry[1]
+
+        texture = video.Texture.from_surface(self.renderer, surface)
+        self.uploads += 1
+        self._textures[key] = (surface, texture)
+        if len(self._textures) > self.capacity:
+            self._textures.popitem(last=False)
+        return texture
+
+    def blit(self, surface: pygame.Surface, position) -> None:
+        self.texture(surface).draw(dstrect=pygame.Rect(position, surface.get_size()))
+
+    def fill(self, color, rect=None, blend: int = BLENDMODE_NONE) -> None:
+        renderer = self.renderer
+        renderer.draw_blend_mode = blend
+        renderer.draw_color = color
+        renderer.fill_rect(rect or pygame.Rect((0, 0), renderer.logical_size))
+
+    def draw(self, game, alpha: float = 1.0, hud=None) -> None:
+        # mesma ordem e mesmas fases do profiler que o Game.render
+        profiler = game.profiler
+        self.fill((0, 0, 0, 255))
+        for surface, position in game.particulas.placements():
+            self.blit(surface, position)
+
+        with profiler.phase("draw.ghosts"):
+            for image, distance, (x, y) in game.ghosts.placements(alpha):
+                size, brightness = self.sprites.measure(image, distance)
+                texture = self.texture(image)
+                texture.color = (brightness, brightness, brightness)
+                texture.draw(dstrect=pygame.Rect((int(x), int(y)), size))
+
+        player = game.player
+        image = player.current_image
+        center = player.previous_position.lerp(player.position, alpha)
+        self.blit(image, image.get_rect(center=center).topleft)
+
+        with profiler.phase("draw.overlay"):
+            frame = game.frame
+            bounds = pygame.Rect((0, 0), self.renderer.logical_size)
+            for rect in Compositor.around(bounds, frame.rect):
+                if rect.width > 0 and rect.height > 0:
+                    self.fill((0, 0, 0, OVERLAY_ALPHA), rect, BLENDMODE_BLEND)
+            self.draw_outline(frame.rect, frame.outline_color, frame.thickness)
+
+        with profiler.phase("draw.flash"):
+            flash = int(game.flash.alpha)
+            if flash > 0:
+                self.fill((255, 255, 255, flash), blend=BLENDMODE_BLEND)
+
+        with profiler.phase("draw.hud"):
+            self._hud = game.hud() if hud is None else hud
+            for _, surface, position in self._hud:
+                self.blit(surface, position)
+
+        if profiler.overlay:
+            if self._overlay is None:
+                size = self.renderer.logical_size
+                self._scratch = pygame.Surface(size)
+                self._overlay = video.Texture(self.renderer, size, streaming=True)
+            area = profiler.draw_overlay(self._scratch)
+            if area is not None:
+                # enviado para o canto da textura: só os pixels do overlay
+                # sobem, não a tela inteira
+                source = pygame.Rect((0, 0), area.size)
+                self._overlay.update(self._scratch.subsurface(area), source)
+                self._overlay.draw(srcrect=source, dstrect=area)
+
+    def draw_outline(self, rect: pygame.Rect, color, thickness: int) -> None:
+        # como o pygame.draw.rect com largura: a borda cresce para dentro
+        color = (*pygame.Color(color)[:3], 255)
+        inner = rect.height - 2 * thickness
+        for edge in (
+            pygame.Rect(rect.left, rect.top, rect.width, thickness),
+            pygame.Rect(rect.left, rect.bottom - thickness, rect.width, thickness),
+            pygame.Rect(rect.left, rect.top + thickness, thickness, inner),
+            pygame.Rect(rect.right - thickness, rect.top + thickness, thickness, inner),
+        ):
+            self.fill(color, edge)
+
+    def present(self) -> None:
+        self.renderer.present()
+
+    def snapshot(self, game, alpha: float = 1.0) -> pygame.Surface:
+        # depois do present o conteúdo do renderer é indefinido: desenha de
+        # novo, com o mesmo HUD, e lê de volta
+        self.draw(game, alpha, self._hud)
+        return self.renderer.to_surface()
+
+    def stats(self) -> dict:
+        return {
+            "textures": len(self._textures),
+            "capacity": self.capacity,
+            "uploads": self.uploads,
+        }